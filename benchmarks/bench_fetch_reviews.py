@@ -0,0 +1,94 @@
+# benchmarks/bench_fetch_reviews.py
+#
+# Scaling of review ingestion for large backfills, without network access:
+# a fake SerpAPI client serves pre-built pages of 199 reviews.
+#
+#   python -m benchmarks.bench_fetch_reviews
+
+from datetime import datetime, timedelta
+import time
+
+import pandas as pd
+
+from review_analysis.dataset import fetch_reviews
+
+PAGE_SIZE = 199
+REVIEWS_PER_DAY = 600
+SIZES = [10_000, 50_000, 100_000, 200_000]
+
+# the pre-rewrite implementation is quadratic; keep it to sizes that finish
+LEGACY_MAX_SIZE = 50_000
+
+
+class FakeSerpApiClient:
+    def __init__(self, n_reviews: int, newest: datetime):
+        self.pages = []
+        reviews = []
+        for i in range(n_reviews):
+            ts = newest - timedelta(seconds=i * 86_400 // REVIEWS_PER_DAY)
+            reviews.append({
+                "id": f"r{i}",
+                "snippet": f"review number {i}",
+                "date": ts.strftime("%B %d, %Y"),
+                "iso_date": ts.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            })
+        for start in range(0, n_reviews, PAGE_SIZE):
+            self.pages.append(reviews[start:start + PAGE_SIZE])
+        self.calls = 0
+
+    def search(self, next_page_token=None, **params):
+        index = int(next_page_token or 0)
+        self.calls += 1
+        results = {"reviews": self.pages[index]}
+        if index + 1 < len(self.pages):
+            results["serpapi_pagination"] = {"next_page_token": str(index + 1)}
+        return results
+
+
+def legacy_fetch_reviews(client, START_DATE, END_DATE):
+    """Previous implementation: per-row date parsing, concat + sort per page."""
+    start = datetime.strptime(START_DATE, "%Y-%m-%d").date()
+    end = datetime.strptime(END_DATE, "%Y-%m-%d").date()
+    df = pd.DataFrame(columns=["Date", "Review"])
+
+    results = client.search()
+    while "serpapi_pagination" in results:
+        rows = []
+        for review in results["reviews"]:
+            review_date = pd.to_datetime(review["date"], errors="coerce").date()
+            if start <= review_date <= end:
+                rows.append({"Date": review_date, "Review": review["snippet"]})
+        if not rows:
+            break
+        df = pd.concat([df, pd.DataFrame(rows)], ignore_index=True)
+        results = client.search(next_page_token=results["serpapi_pagination"]["next_page_token"])
+        df = df.sort_values(by="Date", ascending=False).reset_index(drop=True)
+    return df
+
+
+def main():
+    newest = datetime(2026, 1, 7, 23, 59, 59)
+    end_date = newest.strftime("%Y-%m-%d")
+
+    print(f"{'reviews':>10} {'pages':>6} {'streaming (s)':>14} {'legacy (s)':>11}")
+    for n in SIZES:
+        days = n // REVIEWS_PER_DAY + 1
+        start_date = (newest - timedelta(days=days)).strftime("%Y-%m-%d")
+
+        client = FakeSerpApiClient(n, newest)
+        t0 = time.perf_counter()
+        df = fetch_reviews(client, "bench.app", start_date, end_date)
+        streaming = time.perf_counter() - t0
+        assert len(df) == n, (len(df), n)
+
+        legacy = "-"
+        if n <= LEGACY_MAX_SIZE:
+            t0 = time.perf_counter()
+            legacy_fetch_reviews(FakeSerpApiClient(n, newest), start_date, end_date)
+            legacy = f"{time.perf_counter() - t0:.2f}"
+
+        print(f"{n:>10} {client.calls:>6} {streaming:>14.2f} {legacy:>11}")
+
+
+if __name__ == "__main__":
+    main()
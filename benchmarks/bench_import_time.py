@@ -0,0 +1,65 @@
+# benchmarks/bench_import_time.py
+#
+# Cold-start cost of the entry points: each module is imported in a fresh
+# interpreter, and we report which provider SDKs ended up loaded.
+#
+#   python -m benchmarks.bench_import_time
+
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "review_analysis.config",
+    "runner_phase3",
+    "runner_phase2",
+    "runner_phase1",
+    "runner",
+]
+
+# none of these should be imported until a request is actually made
+HEAVY_SDKS = ["serpapi", "anthropic", "groq", "mistralai", "google.genai"]
+
+REPEATS = 5
+
+PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+loaded = [m for m in {sdks!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(module: str):
+    repo_root = Path(__file__).resolve().parents[1]
+    timings, loaded = [], ""
+    for _ in range(REPEATS):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, sdks=HEAVY_SDKS)],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        fields = result.stdout.split()
+        timings.append(float(fields[0]))
+        loaded = fields[1] if len(fields) > 1 else ""
+    return statistics.median(timings), loaded or "-"
+
+
+def main():
+    print(f"{'module':<24} {'median import (s)':>18}  SDKs loaded")
+    for module in MODULES:
+        elapsed, loaded = measure(module)
+        if elapsed is None:
+            print(f"{module:<24} {'failed':>18}  {loaded}")
+            continue
+        print(f"{module:<24} {elapsed:>18.3f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/bench_phase2_replay.py
+#
+# Replays recorded data/processed days through the Phase 2 graph against
+# simulated providers (benchmarks/fake_llm.py): no API keys, no network,
+# reproducible latency / failure mix.
+#
+#   python -m benchmarks.bench_phase2_replay
+#   python -m benchmarks.bench_phase2_replay --latency 0.8 --error-rate 0.1 --concurrency 8
+#   python -m benchmarks.bench_phase2_replay --adaptive-batching --routing --hedge
+
+from pathlib import Path
+import argparse
+import os
+import tempfile
+import time
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="phase2_replay_"))
+
+# must be set before the llm modules read them
+os.environ.setdefault("LLM_CACHE_PATH", str(SCRATCH_DIR / "llm_responses.sqlite"))
+for provider in ["GROQ", "MISTRAL", "CLAUDE", "GEMINI"]:
+    os.environ.setdefault(f"{provider}_RPM", "100000")
+    os.environ.setdefault(f"{provider}_TPM", "100000000")
+
+from benchmarks.fake_llm import FakeProfile, install_fake_clients  # noqa: E402
+from llm.cache import set_cache_enabled  # noqa: E402
+from review_analysis.fast_path import DEFAULT_FAST_PATH_THRESHOLD  # noqa: E402
+from review_analysis.storage import glob_stored, read_records  # noqa: E402
+from review_analysis.workflow_phase2 import build_phase3_workflow  # noqa: E402
+from runner_phase2 import PROCESSED_DIR, parse_filename, run_phase3_day  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline Phase 2 replay benchmark")
+    parser.add_argument("--input-dir", default=str(PROCESSED_DIR))
+    parser.add_argument("--days", type=int, default=None, help="replay only the first N days")
+
+    fake = parser.add_argument_group("simulated providers (all four)")
+    fake.add_argument("--latency", type=float, default=0.3, help="mean seconds per call")
+    fake.add_argument("--jitter", type=float, default=0.1)
+    fake.add_argument("--error-rate", type=float, default=0.0)
+    fake.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of 429s")
+    fake.add_argument("--malformed-rate", type=float, default=0.0, help="share of truncated JSON")
+    fake.add_argument("--groq-latency", type=float, default=None, help="override for Groq only")
+
+    phase2 = parser.add_argument_group("Phase 2 options")
+    phase2.add_argument("--batch-size", type=int, default=10)
+    phase2.add_argument("--concurrency", type=int, default=4)
+    phase2.add_argument("--adaptive-batching", action="store_true")
+    phase2.add_argument("--routing", action="store_true")
+    phase2.add_argument("--hedge", action="store_true")
+    phase2.add_argument("--fast-path", action="store_true", help="enable the local fast path")
+    phase2.add_argument("--cache", action="store_true", help="keep the LLM response cache on")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    set_cache_enabled(args.cache)
+
+    profile = dict(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        malformed_rate=args.malformed_rate,
+    )
+    profiles = {name: FakeProfile(**profile) for name in ["groq", "mistral", "claude", "gemini"]}
+    if args.groq_latency is not None:
+        profiles["groq"] = FakeProfile(**{**profile, "latency": args.groq_latency})
+    providers = install_fake_clients(profiles)
+
+    days = []
+    for file in glob_stored(Path(args.input_dir), "reviews_"):
+        product_id, date = parse_filename(file.name)
+        if product_id:
+            days.append((product_id, date, file))
+    days.sort(key=lambda x: (x[0], x[1]))
+    days = days[:args.days]
+    if not days:
+        print(f" No processed review files found in {args.input_dir}")
+        return
+
+    graph = build_phase3_workflow()
+    output_dir = SCRATCH_DIR / "output"
+    total_reviews = failed_reviews = 0
+    failed_days = []
+
+    t0 = time.perf_counter()
+    for product_id, date, file in days:
+        reviews = len(read_records(file, columns=["Review"]))
+        total_reviews += reviews
+        # injected failures can escape Phase 2 (e.g. a failed topic rewrite);
+        # like ProductScheduler, one failed day must not end the replay
+        try:
+            run_phase3_day(
+                graph,
+                product_id,
+                date,
+                file,
+                batch_size=args.batch_size,
+                adaptive_batching=args.adaptive_batching,
+                output_dir=str(output_dir),
+                max_concurrency=args.concurrency,
+                fast_path_threshold=DEFAULT_FAST_PATH_THRESHOLD if args.fast_path else None,
+                routing=args.routing,
+                hedge=args.hedge,
+                use_store=False,
+            )
+        except Exception as e:
+            print(f"   Failed for {product_id} {date}: {type(e).__name__}: {e}")
+            failed_days.append((product_id, date))
+            failed_reviews += reviews
+    wall = time.perf_counter() - t0
+
+    calls = sum(p.calls for p in providers.values())
+    print("\n Phase 2 replay")
+    print(" ──────────────")
+    print(f" days:             {len(days) - len(failed_days)} ok, {len(failed_days)} failed")
+    print(f" reviews:          {total_reviews} ({failed_reviews} in failed days)")
+    print(f" wall time:        {wall:.2f}s")
+    print(f" reviews/sec:      {total_reviews / wall:.1f}")
+    print(f" calls/review:     {calls / max(1, total_reviews):.3f}")
+    for name, provider in providers.items():
+        print(f"   {name:<8} {provider.calls:>6} calls  {provider.failures:>5} failures")
+    if failed_days:
+        print(" failed days:      " + ", ".join(f"{p} {d}" for p, d in failed_days))
+    print(f" scratch outputs:  {SCRATCH_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# benchmarks/fake_llm.py
+#
+# Local stand-ins for the Groq, Mistral, Claude and Gemini SDK clients.
+# They are installed as the cached client of each llm/*_client.py module, so
+# rate limiting, retries, caching and JSON parsing all run as in production;
+# only the network call is replaced by a configurable simulated one.
+
+from types import SimpleNamespace
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+import llm.claude_client
+import llm.gemini_client
+import llm.groq_client
+import llm.mistral_client
+
+# topics the fake categorizer draws from; a review always maps to the same one
+SYNTHETIC_TOPICS = [f"Synthetic topic {i:02d}" for i in range(40)]
+
+
+class FakeAPIError(Exception):
+    """Shaped like the SDK errors llm.rate_limit.retry_after_seconds inspects."""
+
+    def __init__(self, status_code: int, headers=None):
+        super().__init__(f"fake provider error {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class FakeProfile:
+    """Simulated behaviour of one provider."""
+
+    def __init__(
+        self,
+        latency: float = 0.3,
+        jitter: float = 0.1,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        retry_after: float = 0.1,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after = retry_after
+
+
+# ======================================================
+# Prompt → Response
+# ======================================================
+def _json_after(prompt: str, marker: str):
+    start = prompt.find(marker)
+    if start < 0:
+        return None
+    start += len(marker)
+    first = min(
+        (i for i in (prompt.find("[", start), prompt.find("{", start)) if i >= 0),
+        default=-1,
+    )
+    if first < 0:
+        return None
+    value, _ = json.JSONDecoder().raw_decode(prompt[first:])
+    return value
+
+
+def _section(prompt: str, marker: str) -> str:
+    """Text between `marker` and the next blank line."""
+    start = prompt.find(marker)
+    if start < 0:
+        return ""
+    return prompt[start + len(marker):].strip("\n").split("\n\n", 1)[0]
+
+
+def _topic_for(review: str) -> str:
+    digest = hashlib.blake2b(review.encode("utf-8"), digest_size=4).digest()
+    return SYNTHETIC_TOPICS[int.from_bytes(digest, "big") % len(SYNTHETIC_TOPICS)]
+
+
+def fake_response(prompt: str):
+    """A well-formed answer for any prompt the llm clients send."""
+    proposals = _json_after(prompt, "Proposals:")
+    if proposals is not None:
+        return [
+            {
+                "index": p["index"],
+                "approved": True,
+                "label": p["proposed_topic"],
+                "description": "synthetic",
+            }
+            for p in proposals
+        ]
+
+    if "Proposed topic:" in prompt:
+        proposed = prompt.split("Proposed topic:", 1)[1].split('"')[1]
+        if '"approved"' in prompt:
+            return {"approved": True, "reason": "synthetic"}
+        return {"label": proposed, "description": "synthetic"}
+
+    # compact categorization protocol (llm.prompts): "T<i>: label" / "<i>: \"review\""
+    topic_ids = {
+        match.group(2): match.group(1)
+        for match in re.finditer(r"^(T\d+): (.+)$", _section(prompt, "Existing topics:"), re.M)
+    }
+    rows = []
+    for match in re.finditer(r"^(\d+): (\".*\")$", _section(prompt, "Reviews:"), re.M):
+        topic = _topic_for(json.loads(match.group(2)))
+        if topic in topic_ids:
+            rows.append([int(match.group(1)), topic_ids[topic], False])
+        else:
+            rows.append([int(match.group(1)), topic, True])
+    return rows
+
+
+# ======================================================
+# Simulated Provider
+# ======================================================
+class FakeProvider:
+    def __init__(self, name: str, profile: FakeProfile, seed: int = 0):
+        self.name = name
+        self.profile = profile
+        self.calls = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+            roll = self._rng.random()
+            delay = max(0.0, self._rng.gauss(self.profile.latency, self.profile.jitter))
+
+        time.sleep(delay)
+
+        p = self.profile
+        if roll < p.rate_limit_rate:
+            with self._lock:
+                self.failures += 1
+            raise FakeAPIError(429, {"retry-after": str(p.retry_after)})
+        roll -= p.rate_limit_rate
+        if roll < p.error_rate:
+            with self._lock:
+                self.failures += 1
+            raise FakeAPIError(500)
+        roll -= p.error_rate
+
+        content = json.dumps(fake_response(prompt), ensure_ascii=False)
+        if roll < p.malformed_rate:
+            return content[: len(content) // 2]  # truncated output
+        return content
+
+
+def _prompt_text(messages, system=None) -> str:
+    parts = []
+    if isinstance(system, str):
+        parts.append(system)
+    elif system:
+        parts.extend(block.get("text", "") for block in system)
+    for message in messages:
+        content = message["content"]
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content)
+    return "\n".join(parts)
+
+
+def _chat_result(text: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class FakeGroq:
+    def __init__(self, provider: FakeProvider):
+        create = lambda messages, **kwargs: _chat_result(provider.complete(_prompt_text(messages)))
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+class FakeMistral:
+    def __init__(self, provider: FakeProvider):
+        complete = lambda messages, **kwargs: _chat_result(provider.complete(_prompt_text(messages)))
+        self.chat = SimpleNamespace(complete=complete)
+
+
+class FakeAnthropic:
+    def __init__(self, provider: FakeProvider):
+        def create(messages, system=None, **kwargs):
+            text = provider.complete(_prompt_text(messages, system))
+            return SimpleNamespace(
+                content=[SimpleNamespace(text=text)],
+                usage=SimpleNamespace(
+                    input_tokens=0,
+                    output_tokens=0,
+                    cache_read_input_tokens=0,
+                    cache_creation_input_tokens=0,
+                ),
+            )
+
+        self.messages = SimpleNamespace(create=create)
+
+
+class FakeGemini:
+    def __init__(self, provider: FakeProvider):
+        generate = lambda contents, **kwargs: SimpleNamespace(text=provider.complete(contents))
+        self.models = SimpleNamespace(generate_content=generate)
+
+
+def install_fake_clients(profiles):
+    """
+    Replaces every provider client with a simulated one.
+    `profiles` maps provider name → FakeProfile. Returns {name: FakeProvider}.
+    """
+    providers = {
+        name: FakeProvider(name, profiles[name], seed=i)
+        for i, name in enumerate(["groq", "mistral", "claude", "gemini"])
+    }
+    llm.groq_client._client = FakeGroq(providers["groq"])
+    llm.mistral_client._client = FakeMistral(providers["mistral"])
+    llm.claude_client._client = FakeAnthropic(providers["claude"])
+    llm.gemini_client._client = FakeGemini(providers["gemini"])
+    return providers
@@ -0,0 +1,162 @@
+# llm/cache.py
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import sqlite3
+import threading
+import time
+
+from llm.metrics import llm_call, record_cache_hit
+from llm.utils import TruncatedResponse
+
+
+CACHE_PATH = Path(
+    os.getenv(
+        "LLM_CACHE_PATH",
+        Path(__file__).resolve().parents[1] / ".cache" / "llm_responses.sqlite",
+    )
+)
+CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# LLM_CACHE_DISABLED=1 bypasses the cache entirely (reads and writes)
+_enabled = os.getenv("LLM_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+_MISS = object()
+
+
+def set_cache_enabled(enabled: bool):
+    global _enabled
+    _enabled = enabled
+
+
+def cache_enabled() -> bool:
+    return _enabled
+
+
+def cache_key(provider: str, model: str, task: str, prompt: str) -> str:
+    """
+    Content address of a request. The prompt is whitespace-normalized so
+    indentation changes in the templates do not invalidate the cache.
+    """
+    normalized = re.sub(r"\s+", " ", prompt).strip()
+    payload = json.dumps([provider, model, task, normalized], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed store of parsed LLM responses with size-based LRU eviction.
+    One connection shared across threads, serialized by a lock.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                task TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return _MISS
+
+            self._conn.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return json.loads(row[0])
+
+    def put(self, key: str, provider: str, task: str, value):
+        payload = json.dumps(value, ensure_ascii=False)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, task, payload, len(payload.encode("utf-8")), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_used ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def cached_completion(provider: str, model: str, task: str, prompt: str, compute):
+    """
+    Returns the cached parsed response for this exact request, otherwise
+    runs `compute()` and stores its result. Failures and salvaged
+    (truncated) responses are never cached.
+    """
+    if not _enabled:
+        with llm_call(provider, task):
+            return compute()
+
+    cache = get_cache()
+    key = cache_key(provider, model, task, prompt)
+
+    value = cache.get(key)
+    if value is not _MISS:
+        record_cache_hit(provider, task)
+        return value
+
+    with llm_call(provider, task):
+        value = compute()
+    if not isinstance(value, TruncatedResponse):
+        cache.put(key, provider, task, value)
+    return value
@@ -2,15 +2,79 @@
 
 import os
 import json
-import anthropic
+import threading
+from llm.cache import cached_completion
+from llm.http import pooled_http_client
+from llm.prompts import encode_topics
+from llm.rate_limit import estimate_tokens, rate_limited_call
 from llm.utils import safe_json_loads
+from llm.metrics import note_usage
 from dotenv import load_dotenv
 load_dotenv()
 
 CLAUDE_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 MODEL_NAME = "claude-sonnet-4-5-20250929"
 
-client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
+# SDK imported and client built on first use, not at import
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            import anthropic
+
+            # retries are owned by llm.rate_limit so 429s honour the shared limiter
+            _client = anthropic.Anthropic(
+                api_key=CLAUDE_API_KEY,
+                max_retries=0,
+                http_client=pooled_http_client(),
+            )
+        return _client
+
+
+def _note_usage(response):
+    usage = getattr(response, "usage", None)
+    note_usage(
+        prompt_tokens=getattr(usage, "input_tokens", None),
+        completion_tokens=getattr(usage, "output_tokens", None),
+        cache_read_tokens=getattr(usage, "cache_read_input_tokens", None),
+        cache_creation_tokens=getattr(usage, "cache_creation_input_tokens", None),
+    )
+
+
+def _create(system, user, max_tokens, task):
+    """
+    Sends `system` as a cacheable prefix and `user` as the per-call suffix.
+
+    The system block (instructions + topic registry) is identical for every
+    call until the registry changes, so Anthropic's prompt cache serves it
+    at a fraction of the cost and latency; only the user part is processed
+    fresh. Prefixes shorter than the model's minimum are just not cached.
+    """
+    response = rate_limited_call(
+        "claude",
+        lambda: _get_client().messages.create(
+            model=MODEL_NAME,
+            max_tokens=max_tokens,
+            system=[
+                {
+                    "type": "text",
+                    "text": system,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            messages=[{"role": "user", "content": user}],
+            temperature=0,
+        ),
+        estimated_tokens=estimate_tokens(system) + estimate_tokens(user) + max_tokens,
+    )
+
+    _note_usage(response)
+    content = response.content[0].text.strip()
+    return safe_json_loads(content, task=task)
 
 
 def claude_complete(proposed_topic, review, existing_topics):
@@ -20,7 +84,8 @@ def claude_complete(proposed_topic, review, existing_topics):
     2. Is NOT semantically similar to existing topics
     """
 
-    prompt = f"""
+    # stable across the day's validations → cached prefix
+    system = f"""
         You are a strict topic approval agent.
 
         Rules:
@@ -28,28 +93,90 @@ def claude_complete(proposed_topic, review, existing_topics):
         - Reject if the topic is not explicitly grounded in the review text.
         - Approve only if the topic is clearly new and distinct.
 
+        Return STRICT JSON only:
+        {{
+        "approved": true/false,
+        "reason": "<short explanation>"
+        }}
+
         Existing topics:
-        {json.dumps(existing_topics, indent=2)}
+        {encode_topics(existing_topics, descriptions=True)}
+        """
 
+    user = f"""
         Proposed topic:
         "{proposed_topic}"
 
         Review:
         "{review}"
+        """
 
-        Return STRICT JSON only:
+    return cached_completion(
+        "claude",
+        MODEL_NAME,
+        "approve",
+        system + user,
+        lambda: _create(system, user, max_tokens=300, task="approve"),
+    )
+
+
+def claude_review_topics(proposals, existing_topics):
+    """
+    Approves and canonicalizes a whole list of new-topic proposals in one call.
+
+    proposals: [{"index": 0, "proposed_topic": "...", "review": "..."}]
+
+    Returns:
+    [
+      {
+        "index": 0,
+        "approved": true,
+        "label": "<canonical topic label>",
+        "description": "<short description>"
+      }
+    ]
+    Proposals describing the same concept receive the identical label.
+    """
+
+    system = f"""
+        You are a strict topic approval agent.
+
+        For EACH proposal decide whether it becomes a new topic.
+
+        Rules:
+        - Reject if the topic is even slightly similar to any existing topic.
+        - Reject if the topic is not explicitly grounded in its review text.
+        - Approve only if the topic is clearly new and distinct.
+        - Rewrite every approved topic into a canonical label:
+          short English phrase, medium granularity.
+        - Proposals that describe the same concept MUST receive the
+          identical canonical label and description.
+
+        Return STRICT JSON only, one entry per proposal:
+        [
         {{
-        "approved": true/false,
-        "reason": "<short explanation>"
+            "index": <proposal index>,
+            "approved": true/false,
+            "label": "<canonical topic label or empty if rejected>",
+            "description": "<short description or empty if rejected>"
         }}
+        ]
+
+        Existing topics:
+        {encode_topics(existing_topics, descriptions=True)}
         """
 
-    response = client.messages.create(
-        model=MODEL_NAME,
-        max_tokens=300,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0,
-    )
+    user = f"""
+        Proposals:
+        {json.dumps(proposals, ensure_ascii=False)}
+        """
 
-    content = response.content[0].text.strip()
-    return safe_json_loads(content)
+    max_tokens = 200 + 80 * len(proposals)
+
+    return cached_completion(
+        "claude",
+        MODEL_NAME,
+        "approve_batch",
+        system + user,
+        lambda: _create(system, user, max_tokens=max_tokens, task="approve_batch"),
+    )
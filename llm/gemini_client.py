@@ -1,9 +1,12 @@
 # llm/gemini_client.py
 
 import os
-import json
-from google import genai
+import threading
+from llm.cache import cached_completion
+from llm.prompts import categorize_prompt, decode_categorization
+from llm.rate_limit import estimate_tokens, rate_limited_call
 from llm.utils import safe_json_loads
+from llm.metrics import note_usage
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -13,7 +16,19 @@ MODEL_NAME = "gemini-2.5-flash-lite"
 #genai.configure(api_key=GEMINI_API_KEY)
 #model = genai.GenerativeModel(MODEL_NAME)
 
-client = genai.Client()
+# SDK imported and client built on first use, not at import
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            from google import genai
+
+            _client = genai.Client()
+        return _client
 
 
 def gemini_complete(reviews=None, existing_topics=None, proposed_topic=None, review=None, task="categorize"):
@@ -24,31 +39,15 @@ def gemini_complete(reviews=None, existing_topics=None, proposed_topic=None, rev
     """
 
     if task == "categorize":
-        prompt = f"""
-        Categorize the following app reviews.
-
-        Rules:
-        - Prefer existing topics.
-        - Create new topics only if strictly necessary.
-        - Topics must be short English phrases.
-        - Medium granularity.
-        - Avoid duplicates aggressively.
-
-        Existing topics:
-        {json.dumps(existing_topics, indent=2)}
-
-        Reviews:
-        {json.dumps(reviews, indent=2)}
-
-        Return STRICT JSON only:
-        [
-        {{
-            "review": "<review text>",
-            "topic": "<topic>",
-            "is_new": true/false
-        }}
-        ]
-        """
+        prompt = categorize_prompt(
+            reviews or [],
+            existing_topics or [],
+            rules="""- Prefer existing topics.
+- Create new topics only if strictly necessary.
+- Topics must be short English phrases.
+- Medium granularity.
+- Avoid duplicates aggressively.""",
+        )
     else:
         prompt = f"""
         Rewrite the proposed topic into a canonical topic name.
@@ -72,6 +71,22 @@ def gemini_complete(reviews=None, existing_topics=None, proposed_topic=None, rev
         }}
         """
 
-    response = client.models.generate_content(model = MODEL_NAME, contents = prompt)
-    text = response.text.strip()
-    return safe_json_loads(text)
+    def _complete():
+        response = rate_limited_call(
+            "gemini",
+            lambda: _get_client().models.generate_content(model = MODEL_NAME, contents = prompt),
+            estimated_tokens=2 * estimate_tokens(prompt),
+        )
+        usage = getattr(response, "usage_metadata", None)
+        note_usage(
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            completion_tokens=getattr(usage, "candidates_token_count", None),
+        )
+
+        text = response.text.strip()
+        return safe_json_loads(text, task=task)
+
+    result = cached_completion("gemini", MODEL_NAME, task, prompt, _complete)
+    if task == "categorize":
+        return decode_categorization(result, reviews or [], existing_topics or [])
+    return result
@@ -1,22 +1,46 @@
 # llm/groq_client.py
 
 import os
-import json
-from groq import Groq
+import threading
+from llm.cache import cached_completion
+from llm.http import pooled_http_client
+from llm.prompts import categorize_prompt, decode_categorization
+from llm.rate_limit import estimate_tokens, rate_limited_call
 from llm.utils import safe_json_loads
+from llm.metrics import note_usage
 from dotenv import load_dotenv
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 MODEL_NAME = "llama-3.3-70b-versatile"
 
-client = Groq(api_key=GROQ_API_KEY)
+# SDK imported and client built on first use, not at import
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            from groq import Groq
+
+            # retries are owned by llm.rate_limit so 429s honour the shared limiter
+            _client = Groq(
+                api_key=GROQ_API_KEY,
+                max_retries=0,
+                http_client=pooled_http_client(),
+            )
+        return _client
 
 
 def groq_complete(reviews, existing_topics):
     """
     Categorize reviews into existing topics or propose new ones.
 
+    The model answers in the compact [index, topic id, is_new] protocol
+    of llm.prompts; rows are mapped back to the batch's own review text.
+
     Returns:
     [
       {
@@ -27,37 +51,35 @@ def groq_complete(reviews, existing_topics):
     ]
     """
 
-    prompt = f"""
-        You are categorizing app reviews into topics.
-
-        Rules:
-        - Use existing topics if semantically similar.
-        - Propose a new topic ONLY if no existing topic fits.
-        - Topics must be short English phrases.
-        - Medium granularity.
-        - Very low tolerance for duplication.
-
-        Existing topics:
-        {json.dumps(existing_topics, indent=2)}
-
-        Reviews:
-        {json.dumps(reviews, indent=2)}
-
-        Return STRICT JSON only in this format:
-        [
-        {{
-            "review": "<review text>",
-            "topic": "<topic name>",
-            "is_new": true/false
-        }}
-        ]
-        """
-
-    response = client.chat.completions.create(
-        model=MODEL_NAME,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.2,
+    prompt = categorize_prompt(
+        reviews,
+        existing_topics,
+        rules="""- Use existing topics if semantically similar.
+- Propose a new topic ONLY if no existing topic fits.
+- Topics must be short English phrases.
+- Medium granularity.
+- Very low tolerance for duplication.""",
     )
 
-    content = response.choices[0].message.content.strip()
-    return safe_json_loads(content)
+    def _complete():
+        response = rate_limited_call(
+            "groq",
+            lambda: _get_client().chat.completions.create(
+                model=MODEL_NAME,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+            ),
+            estimated_tokens=2 * estimate_tokens(prompt),
+        )
+
+        usage = getattr(response, "usage", None)
+        note_usage(
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+        )
+
+        content = response.choices[0].message.content.strip()
+        return safe_json_loads(content, task="categorize")
+
+    rows = cached_completion("groq", MODEL_NAME, "categorize", prompt, _complete)
+    return decode_categorization(rows, reviews, existing_topics)
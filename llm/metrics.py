@@ -0,0 +1,72 @@
+# llm/metrics.py
+
+from contextlib import contextmanager
+import threading
+import time
+
+
+# Receives one record(kind, **fields) per LLM call. The application installs
+# it (review_analysis.metrics does on import); without a sink, events are
+# dropped, so the llm package does not depend on any collector.
+_sink = None
+
+
+def set_event_sink(sink):
+    global _sink
+    _sink = sink
+
+
+def _emit(**fields):
+    if _sink is not None:
+        _sink("llm_call", **fields)
+
+
+# ======================================================
+# LLM Calls
+# ======================================================
+_current = threading.local()
+
+
+@contextmanager
+def llm_call(provider: str, task: str):
+    """
+    Scope of one (uncached) provider call on this thread. The rate limiter
+    and the clients annotate it via note_retry / note_usage; the outcome,
+    latency and JSON-parse failures are emitted when it closes.
+    """
+    call = {"provider": provider, "task": task, "retries": 0}
+    previous = getattr(_current, "call", None)
+    _current.call = call
+    started = time.perf_counter()
+    try:
+        yield call
+    except ValueError:
+        # safe_json_loads → the provider answered, but not with valid JSON
+        call.update(outcome="error", parse_failed=True)
+        raise
+    except Exception:
+        call["outcome"] = "error"
+        raise
+    else:
+        call["outcome"] = "ok"
+    finally:
+        _current.call = previous
+        call["seconds"] = time.perf_counter() - started
+        _emit(**call)
+
+
+def note_retry():
+    call = getattr(_current, "call", None)
+    if call is not None:
+        call["retries"] += 1
+
+
+def note_usage(**fields):
+    """Token counts (prompt_tokens, completion_tokens, ...) of the current call."""
+    call = getattr(_current, "call", None)
+    if call is not None:
+        call.update({k: v for k, v in fields.items() if v is not None})
+
+
+def record_cache_hit(provider: str, task: str):
+    _emit(provider=provider, task=task, outcome="cache_hit", seconds=0.0, retries=0)
@@ -1,13 +1,35 @@
 # llm/mistral_client.py
 
-from mistralai import Mistral
 import os
-import json
+import threading
+from llm.cache import cached_completion
+from llm.http import HTTP_READ_TIMEOUT, pooled_http_client
+from llm.prompts import categorize_prompt, decode_categorization
+from llm.rate_limit import estimate_tokens, rate_limited_call
 from llm.utils import safe_json_loads
+from llm.metrics import note_usage
 
 
 MODEL_NAME = "mistral-small-latest"
 
+# one long-lived client (and connection pool) for every call, built on first use
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            from mistralai import Mistral
+
+            _client = Mistral(
+                api_key=os.getenv("MISTRAL_API_KEY", ""),
+                client=pooled_http_client(),
+                timeout_ms=int(HTTP_READ_TIMEOUT * 1000),
+            )
+        return _client
+
 
 def mistral_complete(
     reviews=None,
@@ -20,49 +42,29 @@ def mistral_complete(
     Mistral LLM wrapper for Phase-3.
 
     Supported tasks:
-    - categorize: batch review → topic assignment
+    - categorize: batch review → topic assignment (compact protocol, see llm.prompts)
     - rewrite: canonical topic rewrite
     """
 
-    with Mistral(
-        api_key=os.getenv("MISTRAL_API_KEY", ""),
-    ) as mistral:
-
-        # --------------------------------------------------
-        # Categorization task
-        # --------------------------------------------------
-        if task == "categorize":
-            prompt = f"""
-You are categorizing app reviews into topics.
-
-Rules:
-- Reuse existing topics if semantically similar.
+    # --------------------------------------------------
+    # Categorization task
+    # --------------------------------------------------
+    if task == "categorize":
+        prompt = categorize_prompt(
+            reviews or [],
+            existing_topics or [],
+            rules="""- Reuse existing topics if semantically similar.
 - Propose a new topic ONLY if no existing topic fits.
 - Topics must be short English phrases.
 - Medium granularity.
-- Very low tolerance for duplication.
-
-Existing topics:
-{json.dumps(existing_topics or [], indent=2)}
-
-Reviews:
-{json.dumps(reviews or [], indent=2)}
-
-Return STRICT JSON only in this format:
-[
-  {{
-    "review": "<review text>",
-    "topic": "<topic name>",
-    "is_new": true/false
-  }}
-]
-"""
+- Very low tolerance for duplication.""",
+        )
 
-        # --------------------------------------------------
-        # Canonical rewrite task
-        # --------------------------------------------------
-        elif task == "rewrite":
-            prompt = f"""
+    # --------------------------------------------------
+    # Canonical rewrite task
+    # --------------------------------------------------
+    elif task == "rewrite":
+        prompt = f"""
 Rewrite the proposed topic into a canonical topic.
 
 Rules:
@@ -84,25 +86,41 @@ Return STRICT JSON only:
 }}
 """
 
-        else:
-            raise ValueError(f"Unsupported task: {task}")
+    else:
+        raise ValueError(f"Unsupported task: {task}")
 
+    def _complete():
         # --------------------------------------------------
         # Call Mistral
         # --------------------------------------------------
-        res = mistral.chat.complete(
-            model=MODEL_NAME,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            stream=False,
+        res = rate_limited_call(
+            "mistral",
+            lambda: _get_client().chat.complete(
+                model=MODEL_NAME,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt,
+                    }
+                ],
+                stream=False,
+            ),
+            estimated_tokens=2 * estimate_tokens(prompt),
         )
 
         # --------------------------------------------------
         # Extract & safely parse JSON
         # --------------------------------------------------
+        usage = getattr(res, "usage", None)
+        note_usage(
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+        )
+
         content = res.choices[0].message.content
-        return safe_json_loads(content)
+        return safe_json_loads(content, task=task)
+
+    result = cached_completion("mistral", MODEL_NAME, task, prompt, _complete)
+    if task == "categorize":
+        return decode_categorization(result, reviews or [], existing_topics or [])
+    return result
@@ -0,0 +1,115 @@
+# llm/prompts.py
+
+import json
+from typing import Dict, List
+
+from llm.utils import TruncatedResponse
+
+
+# ======================================================
+# Compact Encodings
+# ======================================================
+def topic_id(position: int) -> str:
+    return f"T{position}"
+
+
+def encode_topics(topics: List[Dict], descriptions: bool = False) -> str:
+    """
+    One line per topic, "T<i>: <label>" (optionally " - <description>"),
+    instead of an indented JSON dump of the registry.
+    """
+    if not topics:
+        return "(none yet)"
+
+    lines = []
+    for position, topic in enumerate(topics):
+        label = topic["label"] if isinstance(topic, dict) else topic
+        line = f"{topic_id(position)}: {label}"
+        if descriptions and isinstance(topic, dict) and topic.get("description"):
+            line += f" - {topic['description']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def encode_reviews(reviews: List[str]) -> str:
+    """One line per review, "<i>: <JSON string>" (escaping keeps it single-line)."""
+    return "\n".join(
+        f"{position}: {json.dumps(review, ensure_ascii=False)}"
+        for position, review in enumerate(reviews)
+    )
+
+
+# ======================================================
+# Categorization Protocol
+# ======================================================
+CATEGORIZE_RESPONSE_FORMAT = """Return STRICT JSON only: one [index, topic, is_new] row per review.
+- index: the review's number.
+- topic: the id (e.g. "T3") of an existing topic, or the name of a new topic.
+- is_new: false for an existing topic id, true for a new topic name.
+Do not repeat the review text.
+
+Example:
+[[0, "T3", false], [1, "<new topic name>", true]]"""
+
+
+def categorize_prompt(reviews: List[str], existing_topics: List[Dict], rules: str) -> str:
+    return f"""You are categorizing app reviews into topics.
+
+Rules:
+{rules}
+
+Existing topics:
+{encode_topics(existing_topics)}
+
+Reviews:
+{encode_reviews(reviews)}
+
+{CATEGORIZE_RESPONSE_FORMAT}"""
+
+
+def decode_categorization(rows, reviews: List[str], existing_topics: List[Dict]) -> List[Dict]:
+    """
+    Maps compact [index, topic, is_new] rows back to
+    {"review", "topic", "is_new"} items. An existing topic may be given by
+    id or by its label; is_new must be a JSON boolean. Rows with an unknown
+    or repeated index, an unknown topic id or a non-boolean is_new are
+    dropped; their reviews stay unassigned (only the first row per index counts).
+    Rows salvaged from a cut-off reply stay a TruncatedResponse.
+    """
+    if not isinstance(rows, list):
+        raise ValueError("Categorization response is not a JSON array")
+
+    labels = {}
+    for position, topic in enumerate(existing_topics or []):
+        label = topic["label"] if isinstance(topic, dict) else topic
+        labels[topic_id(position)] = label
+        labels.setdefault(label.strip().lower(), label)
+
+    items = []
+    seen = set()
+    for row in rows:
+        if not isinstance(row, list) or len(row) != 3:
+            continue
+        index, topic, is_new = row
+
+        # bool is an int subclass; negative indexes would wrap around
+        if type(index) is not int or not 0 <= index < len(reviews) or index in seen:
+            continue
+        if not isinstance(is_new, bool):
+            continue
+        if not isinstance(topic, str) or not topic.strip():
+            continue
+        topic = topic.strip()
+
+        existing = labels.get(topic, labels.get(topic.lower()))
+        if existing is not None:
+            items.append({"review": reviews[index], "topic": existing, "is_new": False})
+        elif is_new:
+            items.append({"review": reviews[index], "topic": topic, "is_new": True})
+        else:
+            continue
+        seen.add(index)
+
+    if isinstance(rows, TruncatedResponse):
+        return TruncatedResponse(items)
+    return items
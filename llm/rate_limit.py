@@ -0,0 +1,147 @@
+# llm/rate_limit.py
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from llm.metrics import note_retry
+
+
+# Default (requests/minute, tokens/minute) per provider.
+# Override with <PROVIDER>_RPM / <PROVIDER>_TPM environment variables.
+PROVIDER_LIMITS = {
+    "groq": (30, 12_000),
+    "mistral": (60, 500_000),
+    "claude": (50, 30_000),
+    "gemini": (15, 250_000),
+}
+
+DEFAULT_RETRY_AFTER_SECONDS = 10.0
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class TokenBucket:
+    """
+    Bucket holding up to `per_minute` units, refilled continuously.
+    Not thread-safe on its own; guarded by the owning RateLimiter.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # a single request larger than the bucket only waits for a full bucket
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Per-provider limiter combining a requests/minute and a tokens/minute
+    bucket, plus a hard block window set from 429 Retry-After headers.
+    Shared by every thread calling the same provider.
+    """
+
+    def __init__(self, provider: str, requests_per_minute: float, tokens_per_minute: float):
+        self.provider = provider
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = max(
+                    self.blocked_until - now,
+                    self.requests.wait_time(1, now),
+                    self.tokens.wait_time(tokens, now),
+                )
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    return
+            time.sleep(wait)
+
+    def block_for(self, seconds: float):
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> RateLimiter:
+    with _limiters_lock:
+        if provider not in _limiters:
+            rpm, tpm = PROVIDER_LIMITS[provider]
+            prefix = provider.upper()
+            _limiters[provider] = RateLimiter(
+                provider,
+                requests_per_minute=float(os.getenv(f"{prefix}_RPM", rpm)),
+                tokens_per_minute=float(os.getenv(f"{prefix}_TPM", tpm)),
+            )
+        return _limiters[provider]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def retry_after_seconds(exc: Exception) -> Optional[float]:
+    """
+    Returns the Retry-After delay if `exc` is a 429 from any provider SDK,
+    None for every other error.
+    """
+    response = getattr(exc, "response", None) or getattr(exc, "raw_response", None)
+
+    status = getattr(exc, "status_code", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    if status != 429:
+        return None
+
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+def rate_limited_call(provider: str, fn, estimated_tokens: int):
+    """
+    Calls `fn()` once the provider's buckets allow it.
+    On 429 the whole provider is paused for Retry-After and the call retried.
+    """
+    limiter = get_limiter(provider)
+
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        limiter.acquire(estimated_tokens)
+        try:
+            return fn()
+        except Exception as exc:
+            delay = retry_after_seconds(exc)
+            if delay is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            print(f" {provider} rate limited. Retrying in {delay:.0f}s...")
+            note_retry()
+            limiter.block_for(delay)
@@ -0,0 +1,188 @@
+# llm/router.py
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+import os
+import threading
+import time
+
+
+ROUTER_WINDOW = int(os.getenv("ROUTER_WINDOW", 50))      # calls kept per provider
+MIN_SAMPLES = 5                                            # before percentiles are trusted
+UNHEALTHY_ERROR_RATE = 0.5
+PROVIDER_COOLDOWN_SECONDS = 60.0                           # then an unhealthy provider is retried
+
+# hedge after the primary's p95, but never sooner than this;
+# the default applies until the primary has MIN_SAMPLES calls
+MIN_HEDGE_AFTER_SECONDS = 2.0
+DEFAULT_HEDGE_AFTER_SECONDS = float(os.getenv("HEDGE_AFTER_SECONDS", 15))
+
+_pool = ThreadPoolExecutor(max_workers=int(os.getenv("ROUTER_MAX_WORKERS", 32)))
+
+
+class ProviderUnavailable(Exception):
+    """
+    Raised by a call that declined to run (e.g. a spent daily budget).
+    The router moves on to the next provider without counting it as a
+    provider error.
+    """
+
+
+class ProviderStats:
+    """Rolling window of (latency, ok) for one provider. Thread-safe."""
+
+    def __init__(self, window: int = ROUTER_WINDOW):
+        self.calls = deque(maxlen=window)
+        self.last_failure = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            self.calls.append((latency, ok))
+            if not ok:
+                self.last_failure = time.monotonic()
+
+    def percentile(self, q: float):
+        """Latency percentile of successful calls, None without enough data."""
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self.calls if ok)
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.calls:
+                return 0.0
+            return sum(1 for _, ok in self.calls if not ok) / len(self.calls)
+
+    def healthy(self) -> bool:
+        if self.error_rate() < UNHEALTHY_ERROR_RATE:
+            return True
+        return time.monotonic() - self.last_failure > PROVIDER_COOLDOWN_SECONDS
+
+    def summary(self) -> Dict:
+        return {
+            "calls": len(self.calls),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "error_rate": self.error_rate(),
+        }
+
+
+class ProviderRouter:
+    """
+    Routes a request to the fastest healthy provider.
+
+    Providers are ranked healthy-first, then by rolling p50 latency; ties and
+    providers without enough data keep the caller's preference order. Errors
+    fall through to the next provider. With `hedge=True`, a second provider
+    is started once the first has run past its own p95 and whichever
+    succeeds first wins; the slower call still completes in the background
+    and feeds the stats.
+
+    Providers listed in `exclusive` (budgeted ones) are never started as a
+    hedge, so a call that would lose the race never spends their budget.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, provider: str) -> ProviderStats:
+        with self._lock:
+            if provider not in self.stats:
+                self.stats[provider] = ProviderStats()
+            return self.stats[provider]
+
+    def ranked(self, providers: List[str]) -> List[str]:
+        def key(item):
+            position, provider = item
+            stats = self._stats(provider)
+            p50 = stats.percentile(0.5)
+            return (not stats.healthy(), p50 if p50 is not None else float("inf"), position)
+
+        return [provider for _, provider in sorted(enumerate(providers), key=key)]
+
+    def hedge_after(self, provider: str) -> float:
+        p95 = self._stats(provider).percentile(0.95)
+        if p95 is None:
+            return DEFAULT_HEDGE_AFTER_SECONDS
+        return max(MIN_HEDGE_AFTER_SECONDS, p95)
+
+    def _timed(self, provider: str, fn: Callable):
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except ProviderUnavailable:
+            raise
+        except Exception:
+            self._stats(provider).record(time.perf_counter() - started, ok=False)
+            raise
+        self._stats(provider).record(time.perf_counter() - started, ok=True)
+        return result
+
+    def call(self, calls: Dict[str, Callable], hedge: bool = False, exclusive=()):
+        """
+        `calls` maps provider → zero-argument callable, in preference order.
+        Returns (provider, result); raises the last error if every provider fails.
+        """
+        order = self.ranked(list(calls))
+
+        if not hedge or len(order) < 2 or order[0] in exclusive:
+            error = None
+            for provider in order:
+                try:
+                    return provider, self._timed(provider, calls[provider])
+                except Exception as e:
+                    error = e
+            raise error
+
+        remaining = list(order)
+        pending = {}
+
+        def launch(provider):
+            remaining.remove(provider)
+            pending[_pool.submit(self._timed, provider, calls[provider])] = provider
+
+        launch(order[0])
+        deadline = self.hedge_after(order[0])
+        error = None
+
+        while pending:
+            done, _ = wait(pending, timeout=deadline, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # primary is slower than usual → race it against the next provider
+                hedges = [provider for provider in remaining if provider not in exclusive]
+                if hedges:
+                    launch(hedges[0])
+                deadline = None
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    return provider, future.result()
+                except Exception as e:
+                    error = e
+
+            # sequential fallback; budgeted providers are fine here (nothing to race)
+            if not pending and remaining:
+                launch(remaining[0])
+
+        raise error
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ProviderRouter:
+    """Process-wide router, so latency history is shared across days and products."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ProviderRouter()
+        return _router
@@ -1,39 +1,146 @@
 # llm/utils.py
 
 import json
-import re
 
 
-def safe_json_loads(text: str):
+# ======================================================
+# Response Schemas (per task)
+# ======================================================
+# type: expected JSON type; required: key → type for objects;
+# length: exact size for arrays; items: schema every array item must match
+TASK_SCHEMAS = {
+    # compact rows, see llm.prompts: [index, topic id or new name, is_new]
+    "categorize": {"type": list, "items": {"type": list, "length": 3}},
+    "approve": {"type": dict, "required": {"approved": bool}},
+    "approve_batch": {
+        "type": list,
+        "items": {"type": dict, "required": {"index": int, "approved": bool}},
+    },
+    "rewrite": {"type": dict, "required": {"label": str}},
+}
+
+
+def _matches(value, schema) -> bool:
+    if not isinstance(value, schema["type"]):
+        return False
+    if "length" in schema and len(value) != schema["length"]:
+        return False
+    for key, expected in schema.get("required", {}).items():
+        if not isinstance(value.get(key), expected):
+            return False
+    return True
+
+
+def validate_response(value, task: str):
+    """
+    Checks a parsed response against TASK_SCHEMAS[task]. Array items that
+    do not match are dropped; a wrong top-level shape, or an array with no
+    valid item left, raises ValueError. Unknown tasks pass through.
+    """
+    schema = TASK_SCHEMAS.get(task)
+    if schema is None:
+        return value
+
+    if not _matches(value, schema):
+        raise ValueError(f"LLM response does not match the '{task}' schema")
+
+    if "items" in schema:
+        valid = [item for item in value if _matches(item, schema["items"])]
+        if value and not valid:
+            raise ValueError(f"No item of the LLM response matches the '{task}' schema")
+        return valid
+
+    return value
+
+
+# ======================================================
+# JSON Extraction
+# ======================================================
+class TruncatedResponse(list):
+    """
+    The completed items of an array the model was cut off in. Callers use
+    it as a plain list; the type tells them the output did not fit (so the
+    batch was too large) and that the result must not be cached.
+    """
+
+
+def _scan_value(text: str, start: int):
+    """
+    Walks one JSON value from the bracket at `start`, tracking strings and
+    nesting. Returns (end, cut): `end` is the index after the balanced
+    closing bracket (None if the text ends first) and `cut` the index after
+    the last complete top-level item, for salvaging truncated arrays.
+    """
+    depth = 0
+    in_string = escaped = False
+    cut = None
+
+    for position in range(start, len(text)):
+        char = text[position]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+            if depth == 0:
+                return position + 1, cut
+            if depth == 1:
+                cut = position + 1
+        elif char == "," and depth == 1:
+            cut = position
+
+    return None, cut
+
+
+def safe_json_loads(text: str, task: str = None):
     """
     Extracts and parses JSON from LLM output.
+
+    Single pass over the text: the first balanced [...] / {...} value that
+    parses (and matches the `task` schema, see TASK_SCHEMAS) is returned,
+    whether it is bare, fenced in ```json or surrounded by prose. A top-level
+    array cut off mid-response keeps its completed items, returned as a
+    TruncatedResponse.
+
     Raises ValueError if parsing fails.
     """
     if not text or not text.strip():
         raise ValueError("Empty LLM response")
 
-    text = text.strip()
+    position = 0
+    while True:
+        starts = [i for i in (text.find("[", position), text.find("{", position)) if i >= 0]
+        if not starts:
+            break
+        start = min(starts)
 
-    # Case 1: Raw JSON
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
+        end, cut = _scan_value(text, start)
 
-    # Case 2: Markdown fenced JSON
-    match = re.search(r"```json(.*?)```", text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(1).strip())
-        except json.JSONDecodeError:
-            pass
+        # Unbalanced: a truncated array keeps its completed items; otherwise
+        # the bracket was prose (e.g. "[cannot be sure") → next candidate
+        if end is None:
+            if text[start] == "[" and cut is not None:
+                try:
+                    return TruncatedResponse(
+                        validate_response(json.loads(text[start:cut] + "]"), task)
+                    )
+                except ValueError:
+                    pass
+            position = start + 1
+            continue
 
-    # Case 3: First JSON-like block
-    match = re.search(r"(\{.*\}|\[.*\])", text, re.DOTALL)
-    if match:
         try:
-            return json.loads(match.group(1).strip())
-        except json.JSONDecodeError:
-            pass
+            return validate_response(json.loads(text[start:end]), task)
+        except ValueError:
+            # not JSON, or the wrong shape (e.g. "[1]" in prose) → next candidate
+            position = end
 
     raise ValueError("LLM response is not valid JSON")
@@ -0,0 +1,135 @@
+# review_analysis/batching.py
+
+from typing import Dict, List
+import json
+import os
+import threading
+
+from llm.prompts import encode_topics
+from llm.rate_limit import estimate_tokens
+
+
+# (prompt tokens, output tokens) one categorization call may use per provider.
+# Groq's prompt budget keeps prompt + expected output inside its 12k TPM bucket.
+PROVIDER_TOKEN_BUDGETS = {
+    "groq": (
+        int(os.getenv("GROQ_PROMPT_BUDGET", 5_000)),
+        int(os.getenv("GROQ_OUTPUT_BUDGET", 3_000)),
+    ),
+    "mistral": (
+        int(os.getenv("MISTRAL_PROMPT_BUDGET", 24_000)),
+        int(os.getenv("MISTRAL_OUTPUT_BUDGET", 8_000)),
+    ),
+}
+
+# the fallback chain receives the same batch, so it must fit every provider
+CATEGORIZE_PROVIDERS = ["groq", "mistral"]
+
+PROMPT_OVERHEAD_TOKENS = 200      # instructions + JSON format block
+OUTPUT_TOKENS_PER_REVIEW = 15     # one [index, topic id or new name, is_new] row
+MAX_BATCH_REVIEWS = 50
+
+TARGET_BATCH_LATENCY_SECONDS = float(os.getenv("TARGET_BATCH_LATENCY_SECONDS", 20))
+MIN_BUDGET_SCALE = 0.125
+
+
+class TokenBudgetBatcher:
+    """
+    Packs reviews into batches by estimated tokens instead of a fixed count.
+
+    A batch closes when its prompt (instructions + candidate topics + reviews)
+    or its expected output (one compact row per review) would exceed the
+    budget, so one-emoji reviews share a call while long ones get fewer
+    neighbours.
+
+    The budget is scaled AIMD-style from observed calls: halved on a JSON
+    parse failure or a truncated (salvaged) output, shrunk when calls are
+    slower than the target latency, and grown back gradually otherwise.
+    """
+
+    def __init__(
+        self,
+        prompt_budget: int,
+        output_budget: int,
+        max_reviews: int = MAX_BATCH_REVIEWS,
+        target_latency: float = TARGET_BATCH_LATENCY_SECONDS,
+    ):
+        self.prompt_budget = prompt_budget
+        self.output_budget = output_budget
+        self.max_reviews = max_reviews
+        self.target_latency = target_latency
+        self.scale = 1.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_providers(cls, providers: List[str] = CATEGORIZE_PROVIDERS):
+        return cls(
+            prompt_budget=min(PROVIDER_TOKEN_BUDGETS[p][0] for p in providers),
+            output_budget=min(PROVIDER_TOKEN_BUDGETS[p][1] for p in providers),
+        )
+
+    def observe(self, latency: float = None, parse_failed: bool = False):
+        """
+        Feeds back one primary-provider call that answered: its latency, or
+        a parse failure / truncated output. Transport errors (5xx, timeouts,
+        rate limits) say nothing about batch size and are not observed.
+        Safe from worker threads.
+        """
+        with self._lock:
+            if parse_failed:
+                self.scale = max(MIN_BUDGET_SCALE, self.scale * 0.5)
+            elif latency is not None and latency > self.target_latency:
+                self.scale = max(MIN_BUDGET_SCALE, self.scale * 0.8)
+            else:
+                self.scale = min(1.0, self.scale + 0.1)
+
+    def pack(
+        self,
+        reviews: List[str],
+        topic_tokens: int,
+        limit: int = None,
+        start: int = 0,
+    ) -> List[List[str]]:
+        """
+        Greedily packs `reviews[start:]` into at most `limit` batches against
+        the current budget. Every batch holds at least one review.
+        """
+        with self._lock:
+            scale = self.scale
+
+        prompt_budget = self.prompt_budget * scale - PROMPT_OVERHEAD_TOKENS - topic_tokens
+        output_budget = self.output_budget * scale
+        max_reviews = max(1, int(self.max_reviews * scale))
+
+        batches, batch = [], []
+        prompt_used = output_used = 0
+
+        for position in range(start, len(reviews)):
+            review = reviews[position]
+            tokens = estimate_tokens(json.dumps(review, ensure_ascii=False))
+            fits = (
+                len(batch) < max_reviews
+                and prompt_used + tokens <= prompt_budget
+                and output_used + OUTPUT_TOKENS_PER_REVIEW <= output_budget
+            )
+            if batch and not fits:
+                batches.append(batch)
+                if limit is not None and len(batches) == limit:
+                    return batches
+                batch, prompt_used, output_used = [], 0, 0
+
+            batch.append(review)
+            prompt_used += tokens
+            output_used += OUTPUT_TOKENS_PER_REVIEW
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+
+def topic_prompt_tokens(topics: Dict[str, Dict], top_k: int) -> int:
+    """Upper estimate of the candidate-topic block sent with each batch."""
+    if not topics:
+        return 0
+    total = estimate_tokens(encode_topics(list(topics.values())))
+    return total * min(top_k, len(topics)) // len(topics)
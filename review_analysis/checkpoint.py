@@ -0,0 +1,45 @@
+# review_analysis/checkpoint.py
+
+from pathlib import Path
+from typing import Dict, List
+import json
+import os
+
+
+class BatchJournal:
+    """
+    Append-only JSONL journal of completed Phase 2 batches for one product/day.
+
+    Each line records the reviews a batch covered and what merging it changed
+    (assignments, newly approved topics, count deltas, Mistral calls), so a
+    rerun can replay finished batches instead of re-paying their LLM calls.
+    The journal is deleted once the day's outputs are persisted.
+    """
+
+    def __init__(self, output_dir: str, product_id: str, date: str):
+        self.path = Path(output_dir) / product_id / "checkpoints" / f"journal_{date}.jsonl"
+
+    def load(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # torn write from a crash: everything after it is unreliable
+                    break
+        return entries
+
+    def append(self, entry: Dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
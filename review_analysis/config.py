@@ -1,9 +1,7 @@
 from pathlib import Path
 from dotenv import load_dotenv
 import os
-import pandas as pd
-from datetime import datetime
-import serpapi
+import threading
 
 # Load environment variables from .env file if it exists
 load_dotenv()
@@ -23,4 +21,17 @@ REPORTS_DIR = PROJ_ROOT / "reports"
 FIGURES_DIR = REPORTS_DIR / "figures"
 
 api_key = os.getenv("SERPAPI_KEY")
-client = serpapi.Client(api_key=api_key)
+
+# built on first use: Phase 2/3 never pay for importing the SerpAPI SDK
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_serpapi_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            import serpapi
+
+            _client = serpapi.Client(api_key=api_key)
+        return _client
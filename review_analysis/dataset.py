@@ -3,14 +3,20 @@ from dotenv import load_dotenv
 import os
 import pandas as pd
 from datetime import datetime
-import serpapi
 from typing import Optional
+import json
 import re
 
 # Load environment variables from .env file if it exists
 load_dotenv()
 
 
+# Columns used to maintain the watermark. ReviewId is also kept in the day
+# files so re-fetched reviews can be skipped; IsoDate is never persisted.
+WATERMARK_COLUMNS = ["ReviewId", "IsoDate"]
+TRANSIENT_COLUMNS = ["IsoDate"]
+
+
 def filter_reviews_by_date(data, start_date, end_date):
     """
     Filter reviews by date range and return a DataFrame with Date and Review columns.
@@ -18,7 +24,7 @@ def filter_reviews_by_date(data, start_date, end_date):
     Parameters:
     -----------
     data : list of dict
-        List of review dictionaries containing 'iso_date' and 'snippet' fields
+        List of review dictionaries containing 'date' and 'snippet' fields
     start_date : str or datetime
         Start date in format 'YYYY-MM-DD' or datetime object
     end_date : str or datetime
@@ -27,83 +33,197 @@ def filter_reviews_by_date(data, start_date, end_date):
     Returns:
     --------
     pd.DataFrame
-        DataFrame with 'Date' and 'Review' columns filtered by date range
+        DataFrame with 'Date' and 'Review' columns filtered by date range,
+        plus 'ReviewId' and 'IsoDate' used for the ingestion watermark
     """
     # Convert string dates to datetime objects if needed
     if isinstance(start_date, str):
         start_date = datetime.strptime(start_date, '%Y-%m-%d')
     if isinstance(end_date, str):
         end_date = datetime.strptime(end_date, '%Y-%m-%d')
-    
-    # Extract date and review from data
-    filtered_data = []
-    
-    for review in data:
-        # Parse the iso_date string to datetime
-        #review_date = datetime.fromisoformat(review['iso_date'].replace('Z', '+00:00'))
-        review_date = pd.to_datetime(review['date'], errors='coerce')
-        #print (review_date)
-        
-        # Check if the review date falls within the range (comparing dates only)
-        review_date_only = review_date.date()
-        start_date_only = start_date.date() if hasattr(start_date, 'date') else start_date
-        end_date_only = end_date.date() if hasattr(end_date, 'date') else end_date
-        
-        if start_date_only <= review_date_only <= end_date_only:
-            filtered_data.append({
-                'Date': review_date_only,
-                'Review': review['snippet']
-            })
-    
-    # Create DataFrame
-    df = pd.DataFrame(filtered_data)
 
-    # Sort by Date in descending order (latest first)
-    if not df.empty:
-        df = df.sort_values(by='Date', ascending=False).reset_index(drop=True)
-    
-    return df
+    start_date = pd.Timestamp(start_date).normalize()
+    end_date = pd.Timestamp(end_date).normalize()
+
+    columns = ['Date', 'Review'] + WATERMARK_COLUMNS
+    if not data:
+        return pd.DataFrame(columns=columns)
+
+    raw = pd.DataFrame.from_records(data)
+    for field in ('id', 'iso_date'):
+        if field not in raw:
+            raw[field] = None
+
+    # Parse every date in one vectorized pass (dates only, no time component)
+    review_dates = pd.to_datetime(raw['date'], errors='coerce').dt.normalize()
+    in_range = review_dates.between(start_date, end_date)
+
+    df = pd.DataFrame({
+        'Date': review_dates[in_range].dt.date,
+        'Review': raw.loc[in_range, 'snippet'],
+        'ReviewId': raw.loc[in_range, 'id'],
+        'IsoDate': raw.loc[in_range, 'iso_date'],
+    }, columns=columns)
+
+    # Sort by Date in descending order (latest first); stable keeps page order
+    return df.sort_values(by='Date', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def load_watermark(path):
+    """
+    Watermark = ingested range per product, from its oldest day up to the
+    newest ingested review:
+    {"iso_date": "<latest iso_date>", "ids": [<review ids at that timestamp>],
+     "oldest_day": "YYYY-MM-DD"}
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_watermark(path, watermark):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(watermark, f, indent=4)
+
+
+def _shift_day(day: str, days: int) -> str:
+    return (pd.Timestamp(day) + pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def covered_from(watermark) -> str:
+    """Oldest ingested day; watermarks from before the range was kept only vouch for their own day."""
+    return watermark.get("oldest_day") or watermark["iso_date"][:10]
+
+
+def watermark_covers(watermark, start_date: str) -> bool:
+    """True if everything from `start_date` up to the watermark has been ingested."""
+    return bool(watermark) and start_date >= covered_from(watermark)
+
+
+def update_watermark(watermark, df, start_date: str = None, end_date: str = None):
+    """
+    Advances the watermark past every review in `df`, fetched for the
+    window START_DATE..END_DATE. The ingested range only grows when the
+    window touches it: a backfill of older days that leaves a gap keeps the
+    old range, and a window starting after a gap replaces it.
+    """
+    latest = None
+    if not df.empty and not df["IsoDate"].isna().all():
+        latest = df["IsoDate"].dropna().max()
+        ids = df.loc[df["IsoDate"] == latest, "ReviewId"].dropna().tolist()
+
+    if not watermark:
+        if latest is None:
+            return watermark
+        return {"iso_date": latest, "ids": ids, "oldest_day": start_date or latest[:10]}
+
+    oldest = covered_from(watermark)
+    if start_date is not None:
+        if start_date > _shift_day(watermark["iso_date"][:10], 1):
+            # days between the old range and this window were never fetched
+            if latest is None:
+                return watermark
+            return {"iso_date": latest, "ids": ids, "oldest_day": start_date}
+        if end_date is None or end_date >= _shift_day(oldest, -1):
+            oldest = min(oldest, start_date)
+
+    if latest is None or watermark["iso_date"] > latest:
+        return {**watermark, "oldest_day": oldest}
+    if watermark["iso_date"] == latest:
+        ids = sorted(set(ids) | set(watermark["ids"]))
+
+    return {"iso_date": latest, "ids": ids, "oldest_day": oldest}
+
 
+def is_ingested(review, watermark):
+    """Within the watermark's ingested range and not newer than it."""
+    if not watermark:
+        return False
+    if review.get("id") in watermark["ids"]:
+        return True
+    day = review_day(review)
+    if not day or day < covered_from(watermark):
+        return False
+    iso_date = review.get("iso_date")
+    return bool(iso_date) and iso_date < watermark["iso_date"]
 
-def fetch_reviews(client, product_id, START_DATE, END_DATE):
-    df = pd.DataFrame(columns=["Date", "Review"])
 
-    results = client.search(
-    engine = "google_play_product",
-    product_id = product_id,
-    store = "apps",
-    all_reviews = "true",
-    num = 199,
-    sort_by = 2,
-    json_restrictor = "reviews, serpapi_pagination",
+def iter_review_pages(client, product_id):
+    """
+    Streams raw review pages from SerpAPI, newest first.
+    The caller decides when to stop; no page is requested before it is needed.
+    """
+    params = dict(
+        engine = "google_play_product",
+        product_id = product_id,
+        store = "apps",
+        all_reviews = "true",
+        num = 199,
+        sort_by = 2,
+        json_restrictor = "reviews, serpapi_pagination",
     )
-    
 
-    while "serpapi_pagination" in results:
+    results = client.search(**params)
+    while True:
+        yield results.get("reviews", [])
 
-        temp_df = filter_reviews_by_date(results["reviews"], START_DATE, END_DATE)
-        if len(temp_df)==0:
-            break
-        df = pd.concat ([df, temp_df], ignore_index=True)
-        
+        if "serpapi_pagination" not in results:
+            return
         results = client.search(
-            engine = "google_play_product",
-            product_id = product_id,
-            store = "apps",
-            all_reviews = True,
-            num = 199,
-            sort_by = 2,
-            json_restrictor = "reviews, serpapi_pagination",
-            next_page_token = results["serpapi_pagination"]["next_page_token"],    
+            **params,
+            next_page_token = results["serpapi_pagination"]["next_page_token"],
         )
 
-        
 
-        # Sort by Date in descending order
-        if not df.empty:
-            df = df.sort_values(by='Date', ascending=False).reset_index(drop=True)   
+def review_day(review) -> str:
+    """YYYY-MM-DD of a raw review: iso_date, else the `date` field, else ""."""
+    if review.get("iso_date"):
+        return review["iso_date"][:10]
+    parsed = pd.to_datetime(review.get("date"), errors="coerce")
+    return "" if pd.isna(parsed) else parsed.strftime("%Y-%m-%d")
+
+
+def page_reaches(page, start_date: str) -> bool:
+    """
+    True once a page contains reviews older than the requested window.
+    A page with no datable review also stops pagination, instead of paging
+    through the product's entire history.
+    """
+    days = [day for day in map(review_day, page) if day]
+    return not days or min(days) < start_date
+
+
+def fetch_reviews(client, product_id, START_DATE, END_DATE, watermark=None):
+    """
+    Pages through reviews newest-first, stopping once a page reaches
+    START_DATE. Already-ingested reviews (see is_ingested) are skipped; when
+    the watermark covers the window back to START_DATE, pagination also
+    stops at the first page reaching them.
+
+    Raw records are accumulated in a list and filtered, parsed and sorted
+    once at the end, so cost is linear in the number of reviews.
+    """
+    start_date = pd.Timestamp(START_DATE).strftime("%Y-%m-%d")
+    covered = watermark_covers(watermark, start_date)
+    records = []
+
+    for page in iter_review_pages(client, product_id):
+        if not page:
+            break
+
+        fresh = [review for review in page if not is_ingested(review, watermark)]
+        records.extend(fresh)
+
+        # older days outside the ingested range still have to be fetched
+        if (covered and len(fresh) < len(page)) or page_reaches(page, start_date):
+            break
+
+    return filter_reviews_by_date(records, START_DATE, END_DATE)
 
-    return df
 
 def extract_play_store_id(url: str) -> Optional[str]:
     """
@@ -0,0 +1,123 @@
+# review_analysis/dedup.py
+
+from typing import Dict, List
+import hashlib
+import re
+import unicodedata
+
+
+NEAR_DUPLICATE_THRESHOLD = 0.85
+
+# MinHash / LSH parameters: 16 bands × 4 rows
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_PUNCTUATION = re.compile(r"[!-/:-@\[-`{-~]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_review(text: str) -> str:
+    """
+    Canonical form used to detect duplicates:
+    NFKC, case-folded, ASCII punctuation dropped, whitespace collapsed.
+    Emoji are kept, so "good 👍" and "good" stay distinct.
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    stripped = _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", text)).strip()
+    # punctuation-only reviews keep their original characters
+    return stripped or _WHITESPACE.sub(" ", text).strip()
+
+
+# ======================================================
+# MinHash Signatures
+# ======================================================
+def _permutations(n: int):
+    params = []
+    for i in range(n):
+        digest = hashlib.blake2b(f"perm-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "big") % _MERSENNE_PRIME
+        params.append((a, b))
+    return params
+
+
+_PERMUTATIONS = _permutations(NUM_PERMUTATIONS)
+
+
+def _shingles(text: str) -> set:
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text: str) -> List[int]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in _shingles(text)
+    ]
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def _estimated_jaccard(sig_a: List[int], sig_b: List[int]) -> float:
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+# ======================================================
+# Collapse
+# ======================================================
+def collapse_duplicates(
+    reviews: List[str],
+    near_duplicates: bool = False,
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> Dict[str, List[str]]:
+    """
+    Groups reviews that normalize to the same text (and, optionally, MinHash
+    near-duplicates above `threshold`).
+
+    Returns {normalized key: [member reviews]} in first-seen order; the
+    first member of each group is its representative.
+    """
+    groups: Dict[str, List[str]] = {}
+    for review in reviews:
+        groups.setdefault(normalize_review(review), []).append(review)
+
+    if not near_duplicates:
+        return groups
+
+    rows = NUM_PERMUTATIONS // LSH_BANDS
+    buckets: Dict[tuple, str] = {}
+    signatures: Dict[str, List[int]] = {}
+    merged: Dict[str, List[str]] = {}
+
+    for key, members in groups.items():
+        signature = minhash_signature(key)
+        bands = [
+            (band, tuple(signature[band * rows:(band + 1) * rows]))
+            for band in range(LSH_BANDS)
+        ]
+        target = None
+
+        for bucket in bands:
+            candidate = buckets.get(bucket)
+            if (
+                candidate is not None
+                and _estimated_jaccard(signature, signatures[candidate]) >= threshold
+            ):
+                target = candidate
+                break
+
+        if target is None:
+            # only representatives are indexed, so every bucket entry has a signature
+            signatures[key] = signature
+            merged[key] = list(members)
+            for bucket in bands:
+                buckets.setdefault(bucket, key)
+        else:
+            merged[target].extend(members)
+
+    return merged
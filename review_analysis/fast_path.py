@@ -0,0 +1,177 @@
+# review_analysis/fast_path.py
+
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import math
+import re
+import unicodedata
+
+from review_analysis.dedup import normalize_review
+from review_analysis.storage import glob_stored, read_records
+
+
+DEFAULT_FAST_PATH_THRESHOLD = 0.9
+
+# Longer reviews carry real content and always go to the LLM
+MAX_FAST_PATH_TOKENS = 4
+
+PRAISE_WORDS = {
+    "good", "nice", "super", "supr", "superb", "great", "excellent", "awesome",
+    "amazing", "best", "love", "wonderful", "fantastic", "perfect", "osm",
+    "awsm", "wow", "satisfied", "helpful",
+}
+FILLER_WORDS = {
+    "very", "so", "too", "really", "much", "app", "service", "experience",
+    "thanks", "thank", "you", "is", "it", "the", "a", "and", "delivery",
+}
+# package-id parts that are not the app's name ("in.swiggy.android" → {"swiggy"})
+PACKAGE_ID_PARTS = {"com", "in", "co", "org", "net", "android", "app", "application", "mobile"}
+# Negations and complaint words change the meaning of short reviews;
+# those always need the LLM to pick the specific complaint topic.
+ESCALATE_WORDS = {
+    "not", "no", "never", "nothing", "dont", "don", "didn", "isn", "worst",
+    "bad", "poor", "pathetic", "waste", "sad", "hate", "useless", "fraud",
+    "scam", "late", "cold", "but",
+}
+PRAISE_EMOJI = set("👍👌👏🙏🔥💯⭐🌟❤♥💕💖💗😍🥰😊😁😀😃😄😘🤩☺")
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Word and emoji tokens; emoji modifiers and joiners are dropped."""
+    return [
+        tok for tok in _TOKEN.findall(normalize_review(text))
+        if unicodedata.category(tok[0]) not in ("Mn", "Cf", "Sk")
+    ]
+
+
+def product_words(product_id: str) -> set:
+    """App-name tokens of a Play Store package id, treated as filler."""
+    return {
+        part for part in re.split(r"[^a-z0-9]+", (product_id or "").lower())
+        if part and part not in PACKAGE_ID_PARTS
+    }
+
+
+def is_praise(tokens: List[str], filler: set = frozenset()) -> bool:
+    """
+    Only praise words, praise emoji and filler (FILLER_WORDS plus `filler`),
+    with at least one praise marker.
+    """
+    if not tokens:
+        return False
+    has_praise = False
+    for tok in tokens:
+        if tok in PRAISE_WORDS or tok in PRAISE_EMOJI:
+            has_praise = True
+        elif tok not in FILLER_WORDS and tok not in filler:
+            return False
+    return has_praise
+
+
+# ======================================================
+# Multinomial Naive Bayes (pure Python, CPU only)
+# ======================================================
+class NaiveBayesModel:
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.label_counts: Counter = Counter()
+        self.token_counts: Dict[str, Counter] = defaultdict(Counter)
+        self.label_totals: Counter = Counter()
+        self.vocabulary: set = set()
+
+    def fit(self, samples: List[Tuple[List[str], str]]) -> "NaiveBayesModel":
+        for tokens, label in samples:
+            self.label_counts[label] += 1
+            self.token_counts[label].update(tokens)
+            self.label_totals[label] += len(tokens)
+            self.vocabulary.update(tokens)
+        return self
+
+    def predict(self, tokens: List[str]) -> Optional[Tuple[str, float]]:
+        known = [tok for tok in tokens if tok in self.vocabulary]
+        if not known or not self.label_counts:
+            return None
+
+        n_samples = sum(self.label_counts.values())
+        vocab_size = len(self.vocabulary)
+        scores = {}
+        for label, count in self.label_counts.items():
+            denom = self.label_totals[label] + self.alpha * vocab_size
+            score = math.log(count / n_samples)
+            for tok in known:
+                score += math.log((self.token_counts[label][tok] + self.alpha) / denom)
+            scores[label] = score
+
+        best = max(scores, key=scores.get)
+        top = scores[best]
+        norm = sum(math.exp(s - top) for s in scores.values())
+        return best, 1.0 / norm
+
+
+# ======================================================
+# Fast-path Classifier
+# ======================================================
+class FastPathClassifier:
+    """
+    Cheap local tier in front of the LLMs:
+    1. Praise lexicon → the topic history assigns most praise reviews to
+    2. Naive Bayes trained on past topic_assignments_*.json
+    Only short reviews are eligible; everything else is escalated.
+    """
+
+    def __init__(self, product_id: str = ""):
+        self.filler = product_words(product_id)
+        self.model = NaiveBayesModel()
+        self.praise_topic: Optional[str] = None
+        self.praise_confidence = 0.0
+
+    def fit(self, assignments: List[Dict]) -> "FastPathClassifier":
+        samples = []
+        praise_labels: Counter = Counter()
+
+        for item in assignments:
+            tokens = tokenize(item["review"])
+            if not tokens or len(tokens) > MAX_FAST_PATH_TOKENS:
+                continue
+            samples.append((tokens, item["topic"]))
+            if is_praise(tokens, self.filler):
+                praise_labels[item["topic"]] += 1
+
+        self.model.fit(samples)
+
+        if praise_labels:
+            topic, count = praise_labels.most_common(1)[0]
+            self.praise_topic = topic
+            self.praise_confidence = count / sum(praise_labels.values())
+        return self
+
+    @classmethod
+    def from_history(cls, product_dir: Path, before_date: str) -> "FastPathClassifier":
+        """Trains on assignment files (any storage format) strictly older than `before_date`."""
+        assignments = []
+        for path in glob_stored(product_dir, "topic_assignments_"):
+            if path.stem.replace("topic_assignments_", "") >= before_date:
+                continue
+            assignments.extend(read_records(path).to_dict("records"))
+        # output/<product_id>/ → the app's own name counts as filler
+        return cls(product_id=Path(product_dir).name).fit(assignments)
+
+    def predict(self, review: str) -> Optional[Tuple[str, float]]:
+        tokens = tokenize(review)
+        if not tokens or len(tokens) > MAX_FAST_PATH_TOKENS:
+            return None
+
+        if any(tok in ESCALATE_WORDS for tok in tokens):
+            return None
+
+        if self.praise_topic and is_praise(tokens, self.filler):
+            return self.praise_topic, self.praise_confidence
+
+        # every token must have been seen in history to trust the model
+        if any(tok not in self.model.vocabulary for tok in tokens):
+            return None
+
+        return self.model.predict(tokens)
@@ -0,0 +1,201 @@
+# review_analysis/metrics.py
+
+from collections import defaultdict
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+from llm.metrics import set_event_sink
+
+
+METRICS_DIR = Path(
+    os.getenv("METRICS_DIR", Path(__file__).resolve().parents[1] / "reports" / "metrics")
+)
+
+# METRICS_DISABLED=1 keeps recording in memory but writes no files
+_export_enabled = os.getenv("METRICS_DISABLED", "").lower() not in ("1", "true", "yes")
+
+
+class MetricsRecorder:
+    """
+    In-memory event log for one run: LangGraph node timings and LLM calls.
+    Exported at the end of the outermost run as JSONL (raw events) and
+    Prometheus text format (aggregates).
+    """
+
+    def __init__(self):
+        self.events = []
+        self._active_runs = 0
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, **fields):
+        with self._lock:
+            self.events.append({"ts": time.time(), "kind": kind, **fields})
+
+    def reset(self):
+        with self._lock:
+            self.events = []
+
+    # --------------------------------------------------
+    # Export
+    # --------------------------------------------------
+    def to_prometheus(self, events=None) -> str:
+        if events is None:
+            with self._lock:
+                events = list(self.events)
+
+        node_seconds = defaultdict(float)
+        node_runs = defaultdict(int)
+        call_seconds = defaultdict(float)
+        calls = defaultdict(int)
+        counters = {
+            "llm_prompt_tokens_total": defaultdict(int),
+            "llm_completion_tokens_total": defaultdict(int),
+            "llm_cache_read_tokens_total": defaultdict(int),
+            "llm_cache_creation_tokens_total": defaultdict(int),
+            "llm_retries_total": defaultdict(int),
+            "llm_parse_failures_total": defaultdict(int),
+        }
+
+        for event in events:
+            if event["kind"] == "node":
+                key = (("workflow", event["workflow"]), ("node", event["node"]))
+                node_seconds[key] += event["seconds"]
+                node_runs[key] += 1
+            elif event["kind"] == "llm_call":
+                key = (("provider", event["provider"]), ("task", event["task"]))
+                call_seconds[key] += event["seconds"]
+                calls[key + (("outcome", event["outcome"]),)] += 1
+                counters["llm_prompt_tokens_total"][key] += event.get("prompt_tokens") or 0
+                counters["llm_completion_tokens_total"][key] += event.get("completion_tokens") or 0
+                counters["llm_cache_read_tokens_total"][key] += event.get("cache_read_tokens") or 0
+                counters["llm_cache_creation_tokens_total"][key] += (
+                    event.get("cache_creation_tokens") or 0
+                )
+                counters["llm_retries_total"][key] += event.get("retries", 0)
+                counters["llm_parse_failures_total"][key] += int(event.get("parse_failed", False))
+
+        lines = []
+
+        def emit(name, kind, samples):
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples.items()):
+                rendered = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{name}{{{rendered}}} {value}")
+
+        emit("review_node_seconds_total", "counter", node_seconds)
+        emit("review_node_runs_total", "counter", node_runs)
+        emit("llm_call_seconds_total", "counter", call_seconds)
+        emit("llm_calls_total", "counter", calls)
+        for name, samples in counters.items():
+            emit(name, "counter", samples)
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: Path = None, events=None, run_name: str = None):
+        """Writes <run>_<timestamp>.jsonl and .prom; returns the JSONL path."""
+        directory = Path(directory or METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        base = directory / f"{run_name or 'run'}_{stamp}"
+
+        if events is None:
+            with self._lock:
+                events = list(self.events)
+        with open(f"{base}.jsonl", "w", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        with open(f"{base}.prom", "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(events))
+
+        return Path(f"{base}.jsonl")
+
+
+_recorder = MetricsRecorder()
+
+
+def get_recorder() -> MetricsRecorder:
+    return _recorder
+
+
+# ======================================================
+# Runs
+# ======================================================
+_runs = threading.local()
+
+
+def instrumented_run(name: str):
+    """
+    Decorates a runner entry point. The outermost instrumented run on a
+    thread exports everything recorded since it started; nested runs (e.g.
+    the phase runners called by the end-to-end workflow) just contribute
+    their events. Depth is per thread, so runs started concurrently from
+    different threads each export under their own name.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            recorder = get_recorder()
+            depth = getattr(_runs, "depth", 0)
+            _runs.depth = depth + 1
+            outermost = depth == 0
+            if outermost:
+                with recorder._lock:
+                    recorder._active_runs += 1
+                    start = len(recorder.events)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _runs.depth = depth
+                if outermost:
+                    with recorder._lock:
+                        events = recorder.events[start:]
+                    if _export_enabled and events:
+                        path = recorder.export(events=events, run_name=name)
+                        print(f" Metrics written to {path} (+ .prom)")
+                    with recorder._lock:
+                        recorder._active_runs -= 1
+                        # other runs still index into the log → keep it until the last ends
+                        if recorder._active_runs == 0:
+                            recorder.events = []
+        return wrapper
+    return decorator
+
+
+# ======================================================
+# LangGraph Nodes
+# ======================================================
+def node_timer(workflow: str):
+    """
+    Returns timed(node, fn) for one workflow's builder:
+        graph.add_node("persist", timed("persist", persist_node))
+    """
+    def timed(node: str, fn):
+        return timed_node(workflow, node, fn)
+    return timed
+
+
+def timed_node(workflow: str, node: str, fn):
+    """Wraps a node function so every execution records its wall time."""
+    @wraps(fn)
+    def wrapper(state):
+        started = time.perf_counter()
+        try:
+            return fn(state)
+        finally:
+            get_recorder().record(
+                "node",
+                workflow=workflow,
+                node=node,
+                seconds=time.perf_counter() - started,
+            )
+    return wrapper
+
+
+# LLM clients report their calls through llm.metrics' event sink
+set_event_sink(_recorder.record)
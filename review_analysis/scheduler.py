@@ -0,0 +1,84 @@
+# review_analysis/scheduler.py
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+import os
+import threading
+import time
+
+
+# products in flight at once; each product still runs its days in order
+DEFAULT_MAX_PRODUCTS = int(os.getenv("MAX_CONCURRENT_PRODUCTS", "4"))
+
+
+class ProductScheduler:
+    """
+    Runs Phase 2 for several products in parallel.
+
+    Dates within one product stay strictly ordered (topics.json evolves day
+    to day), while different products proceed independently. Workers are
+    threads, so every product draws from the same process-wide provider
+    rate limiters in llm.rate_limit.
+
+    `run_day(product_id, date, file_path)` processes one day and returns the
+    number of reviews it categorized.
+    """
+
+    def __init__(
+        self,
+        run_day: Callable[[str, str, Path], int],
+        max_products: int = DEFAULT_MAX_PRODUCTS,
+    ):
+        self.run_day = run_day
+        self.max_products = max(1, max_products)
+        self.progress: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _report(self, product_id: str, message: str):
+        with self._lock:
+            p = self.progress[product_id]
+            print(f" [{product_id}] {p['done'] + p['failed']}/{p['days']} days | {message}")
+
+    def _run_product(self, product_id: str, entries: List[Tuple[str, Path]]):
+        for date, file_path in sorted(entries, key=lambda x: x[0]):
+            t0 = time.perf_counter()
+            try:
+                reviews = self.run_day(product_id, date, file_path)
+            except Exception as e:
+                with self._lock:
+                    self.progress[product_id]["failed"] += 1
+                self._report(product_id, f"Failed for {date}: {e}")
+                print("   Completed batches are checkpointed; rerun to resume.")
+                continue
+
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self.progress[product_id]["done"] += 1
+                self.progress[product_id]["reviews"] += reviews
+            self._report(product_id, f"{date}: {reviews} reviews in {elapsed:.1f}s")
+
+    def run(self, product_files: Dict[str, List[Tuple[str, Path]]]) -> Dict[str, Dict]:
+        self.progress = {
+            product_id: {"days": len(entries), "done": 0, "failed": 0, "reviews": 0}
+            for product_id, entries in product_files.items()
+        }
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_products) as pool:
+            futures = [
+                pool.submit(self._run_product, product_id, entries)
+                for product_id, entries in product_files.items()
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - t0
+
+        total_reviews = sum(p["reviews"] for p in self.progress.values())
+        total_days = sum(p["done"] for p in self.progress.values())
+        print(
+            f"\n Scheduler: {len(product_files)} products, {total_days} days, "
+            f"{total_reviews} reviews in {elapsed:.1f}s "
+            f"({total_reviews / elapsed if elapsed else 0:.1f} reviews/s)"
+        )
+        return self.progress
@@ -0,0 +1,132 @@
+# review_analysis/storage.py
+
+from pathlib import Path
+from typing import List, Optional
+import json
+import os
+
+import pandas as pd
+
+
+# json keeps the original pretty-printed record files; parquet is columnar
+# (smaller, faster, single-column reads) and needs pyarrow.
+DEFAULT_STORAGE_FORMAT = os.getenv("REVIEW_STORAGE_FORMAT", "json")
+
+# free-text columns; a missing value reads back as "" rather than NaN/None,
+# which would otherwise reach prompts and cache keys as the float nan
+TEXT_COLUMNS = ["Review", "review", "topic"]
+
+
+def with_extension(base: Path, extension: str) -> Path:
+    # not Path.with_suffix: product ids such as "in.swiggy.android" contain dots
+    return Path(f"{base}{extension}")
+
+
+def _replace_atomically(path: Path, write):
+    """
+    Runs write(tmp_path), then renames over `path`: a crash mid-write
+    leaves the previous file intact instead of a truncated one.
+    """
+    tmp_path = Path(f"{path}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+class JsonStorage:
+    extension = ".json"
+
+    def write(self, df: pd.DataFrame, path: Path) -> Path:
+        """`path` is extension-less; returns the written file."""
+        path = with_extension(path, self.extension)
+        return _replace_atomically(
+            path, lambda tmp: df.to_json(tmp, orient="records", indent=4)
+        )
+
+    def write_records(self, records: List[dict], path: Path, columns: List[str]) -> Path:
+        """Plain json.dump of a list of dicts (the topic_assignments_*.json layout)."""
+        path = with_extension(path, self.extension)
+
+        def dump(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=4)
+
+        return _replace_atomically(path, dump)
+
+    def read(self, path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        df = pd.read_json(path, orient="records", dtype=False, convert_dates=False)
+        if columns is not None:
+            df = df.reindex(columns=columns)
+        return df
+
+
+class ParquetStorage:
+    extension = ".parquet"
+
+    def __init__(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Parquet storage requires pyarrow: pip install pyarrow"
+            ) from e
+
+    def write(self, df: pd.DataFrame, path: Path) -> Path:
+        path = with_extension(path, self.extension)
+        return _replace_atomically(
+            path, lambda tmp: df.to_parquet(tmp, index=False, compression="zstd")
+        )
+
+    def write_records(self, records: List[dict], path: Path, columns: List[str]) -> Path:
+        return self.write(pd.DataFrame(records, columns=columns), path)
+
+    def read(self, path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # only the requested columns are decoded
+        return pd.read_parquet(path, columns=columns)
+
+
+BACKENDS = {
+    "json": JsonStorage,
+    "parquet": ParquetStorage,
+}
+EXTENSIONS = {cls.extension: name for name, cls in BACKENDS.items()}
+
+
+def get_storage(storage_format: Optional[str] = None):
+    storage_format = storage_format or DEFAULT_STORAGE_FORMAT
+    if storage_format not in BACKENDS:
+        raise ValueError(f"Unsupported storage format: {storage_format}")
+    return BACKENDS[storage_format]()
+
+
+def read_records(path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Reads a file written by any backend, chosen by its extension."""
+    path = Path(path)
+    if path.suffix not in EXTENSIONS:
+        raise ValueError(f"Unsupported storage file: {path}")
+    df = get_storage(EXTENSIONS[path.suffix]).read(path, columns=columns)
+    for column in TEXT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].fillna("")
+    return df
+
+
+def find_stored(base: Path) -> Optional[Path]:
+    """Existing file for an extension-less path, in any backend format."""
+    for extension in EXTENSIONS:
+        candidate = with_extension(base, extension)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def glob_stored(directory: Path, prefix: str) -> List[Path]:
+    """All `<prefix>*` files in `directory` written by any backend, sorted."""
+    return sorted(
+        path for path in Path(directory).glob(f"{prefix}*")
+        if path.suffix in EXTENSIONS
+    )
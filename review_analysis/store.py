@@ -0,0 +1,239 @@
+# review_analysis/store.py
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+from review_analysis.config import DATA_DIR
+from review_analysis.storage import glob_stored, read_records
+
+
+DEFAULT_STORE_PATH = Path(os.getenv("REVIEW_STORE_PATH", DATA_DIR / "reviews.sqlite"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    review TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_product_date ON reviews (product_id, date);
+
+CREATE TABLE IF NOT EXISTS topics (
+    product_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    description TEXT,
+    PRIMARY KEY (product_id, label)
+);
+
+CREATE TABLE IF NOT EXISTS assignments (
+    id INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    review TEXT NOT NULL,
+    topic TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assignments_product_date ON assignments (product_id, date);
+CREATE INDEX IF NOT EXISTS idx_assignments_product_topic_date
+    ON assignments (product_id, topic, date);
+
+-- every categorized day, including days without a single assignment
+CREATE TABLE IF NOT EXISTS days (
+    product_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (product_id, date)
+);
+"""
+
+
+class ReviewStore:
+    """
+    Embedded SQLite store of reviews, topics and assignments.
+
+    Runs in WAL mode so readers (drill-downs, Phase 3) never block on a
+    Phase 2 run writing. Every call uses its own short-lived connection,
+    which makes the store safe to share across threads.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    # --------------------------------------------------
+    # Writers (Phase 1 / Phase 2)
+    # --------------------------------------------------
+    def replace_reviews(self, product_id: str, date: str, reviews: List[str]):
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM reviews WHERE product_id = ? AND date = ?", (product_id, date)
+            )
+            conn.executemany(
+                "INSERT INTO reviews (product_id, date, review) VALUES (?, ?, ?)",
+                [(product_id, date, review) for review in reviews],
+            )
+
+    def upsert_topics(self, product_id: str, topics: Dict[str, Dict]):
+        with self._connect() as conn:
+            conn.executemany(
+                # upsert in place: rowid keeps registry (insertion) order
+                """
+                INSERT INTO topics (product_id, label, description) VALUES (?, ?, ?)
+                ON CONFLICT (product_id, label) DO UPDATE SET description = excluded.description
+                """,
+                [
+                    (product_id, topic["label"], topic.get("description"))
+                    for topic in topics.values()
+                ],
+            )
+
+    def replace_assignments(self, product_id: str, date: str, assignments: List[Dict]):
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM assignments WHERE product_id = ? AND date = ?", (product_id, date)
+            )
+            conn.executemany(
+                "INSERT INTO assignments (product_id, date, review, topic) VALUES (?, ?, ?, ?)",
+                [(product_id, date, a["review"], a["topic"]) for a in assignments],
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO days (product_id, date) VALUES (?, ?)", (product_id, date)
+            )
+
+    def import_outputs(self, output_dir, product_id: str) -> int:
+        """
+        One-time backfill of days Phase 2 persisted before the store existed
+        (or with use_store=False): topics.json, topic_assignments_<date> and
+        topic_counts_<date>.json under output/<product_id>/. Days already in
+        the store are left untouched. Returns the number of imported days.
+        """
+        product_dir = Path(output_dir) / product_id
+        known = set(self.categorized_dates(product_id))
+
+        dates = [
+            path.stem.replace("topic_counts_", "")
+            for path in sorted(product_dir.glob("topic_counts_*.json"))
+        ]
+        missing = [date for date in dates if date not in known]
+        if not missing:
+            return 0
+
+        topics_file = product_dir / "topics.json"
+        if topics_file.exists():
+            with open(topics_file, "r", encoding="utf-8") as f:
+                self.upsert_topics(product_id, json.load(f))
+
+        assignment_files = {
+            path.stem.replace("topic_assignments_", ""): path
+            for path in glob_stored(product_dir, "topic_assignments_")
+        }
+        for date in missing:
+            assignments = []
+            if date in assignment_files:
+                assignments = read_records(assignment_files[date]).to_dict("records")
+            self.replace_assignments(product_id, date, assignments)
+
+        print(f" Review store: imported {len(missing)} days of {product_id} from {product_dir}")
+        return len(missing)
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def reviews_for_topic(
+        self,
+        product_id: str,
+        topic: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[Dict]:
+        """Drill-down: every review assigned to `topic` in [start_date, end_date]."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT date, review FROM assignments
+                WHERE product_id = ? AND topic = ?
+                  AND date >= COALESCE(?, date) AND date <= COALESCE(?, date)
+                ORDER BY date, id
+                """,
+                (product_id, topic, start_date, end_date),
+            ).fetchall()
+        return [{"date": date, "review": review} for date, review in rows]
+
+    def topic_counts(
+        self,
+        product_id: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        {date: {topic: count}} aggregated by SQL over the date index.
+        Categorized days without assignments are present with {}.
+        """
+        with self._connect() as conn:
+            dates = conn.execute(
+                """
+                SELECT date FROM days
+                WHERE product_id = ?
+                  AND date >= COALESCE(?, date) AND date <= COALESCE(?, date)
+                """,
+                (product_id, start_date, end_date),
+            ).fetchall()
+            rows = conn.execute(
+                """
+                SELECT date, topic, COUNT(*) FROM assignments
+                WHERE product_id = ?
+                  AND date >= COALESCE(?, date) AND date <= COALESCE(?, date)
+                GROUP BY date, topic
+                """,
+                (product_id, start_date, end_date),
+            ).fetchall()
+
+        counts: Dict[str, Dict[str, int]] = {date: {} for (date,) in dates}
+        for date, topic, count in rows:
+            counts.setdefault(date, {})[topic] = count
+        return counts
+
+    def categorized_dates(self, product_id: str) -> List[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT date FROM days WHERE product_id = ? ORDER BY date", (product_id,)
+            ).fetchall()
+        return [date for (date,) in rows]
+
+    def topic_labels(self, product_id: str) -> List[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT label FROM topics WHERE product_id = ? ORDER BY rowid", (product_id,)
+            ).fetchall()
+        return [label for (label,) in rows]
+
+    def trend_table(
+        self,
+        product_id: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Topic × Date counts for all registered topics."""
+        counts = self.topic_counts(product_id, start_date, end_date)
+        return (
+            pd.DataFrame(counts)
+            .reindex(index=self.topic_labels(product_id), columns=sorted(counts))
+            .fillna(0)
+            .astype(int)
+        )
@@ -0,0 +1,77 @@
+# review_analysis/topic_index.py
+
+from collections import Counter
+from typing import Dict, List
+import math
+import re
+
+from review_analysis.dedup import normalize_review
+
+
+DEFAULT_TOPIC_TOP_K = 25
+
+_WORD = re.compile(r"\w+")
+CHAR_NGRAM = 4
+
+
+def embed(text: str) -> Dict[str, float]:
+    """
+    Sparse, L2-normalized bag of words + character n-grams.
+    Character n-grams make "delivery delay" close to "delayed delivery".
+    """
+    text = normalize_review(text)
+    features: Counter = Counter()
+
+    for word in _WORD.findall(text):
+        features["w:" + word] += 1
+        padded = f" {word} "
+        for i in range(max(1, len(padded) - CHAR_NGRAM + 1)):
+            features["c:" + padded[i:i + CHAR_NGRAM]] += 1
+
+    vector = {key: 1.0 + math.log(count) for key, count in features.items()}
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {key: v / norm for key, v in vector.items()} if norm else {}
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(key, 0.0) for key, v in a.items())
+
+
+class TopicIndex:
+    """
+    In-memory vector index over the topic registry (label + description).
+    Updated incrementally as new topics are approved.
+    """
+
+    def __init__(self, topics: Dict[str, Dict] = None):
+        self.topics: Dict[str, Dict] = {}
+        self.vectors: Dict[str, Dict[str, float]] = {}
+        for topic in (topics or {}).values():
+            self.add(topic)
+
+    def __len__(self):
+        return len(self.topics)
+
+    def add(self, topic: Dict):
+        label = topic["label"]
+        self.topics[label] = topic
+        self.vectors[label] = embed(f"{label} {topic.get('description', '')}")
+
+    def candidates(self, reviews: List[str], k: int = DEFAULT_TOPIC_TOP_K) -> List[Dict]:
+        """
+        Top-k topics for a batch: each topic is scored by its best match
+        against any review in the batch.
+        """
+        if len(self.topics) <= k:
+            return list(self.topics.values())
+
+        review_vectors = [embed(review) for review in reviews]
+        scores = {
+            label: max((_cosine(vector, rv) for rv in review_vectors), default=0.0)
+            for label, vector in self.vectors.items()
+        }
+
+        best = sorted(scores, key=lambda label: (-scores[label], label))[:k]
+        return [self.topics[label] for label in best]
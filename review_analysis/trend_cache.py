@@ -0,0 +1,79 @@
+# review_analysis/trend_cache.py
+
+from pathlib import Path
+from typing import Dict, List
+import hashlib
+import json
+
+
+CACHE_FILENAME = "trend_cache.json"
+
+
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class TrendCache:
+    """
+    Persisted Topic × Date counts for one product, plus the fingerprint
+    (mtime, size, sha256) of every topic_counts_<date>.json folded in.
+
+    Refreshing only re-reads files whose fingerprint changed, so a daily run
+    costs O(new days) of parsing instead of O(history).
+    """
+
+    def __init__(self, product_dir: Path):
+        self.path = Path(product_dir) / CACHE_FILENAME
+        self.files: Dict[str, Dict] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.counts = data.get("counts", {})
+
+    def refresh(self, date_files: List[Path]) -> int:
+        """
+        Folds new or changed daily count files into the cache and drops dates
+        whose files disappeared. Returns the number of files parsed.
+        """
+        parsed = 0
+        seen = set()
+
+        for file in date_files:
+            date = file.stem.replace("topic_counts_", "")
+            seen.add(date)
+
+            stat = file.stat()
+            cached = self.files.get(date)
+            if (
+                cached
+                and date in self.counts
+                and cached["mtime_ns"] == stat.st_mtime_ns
+                and cached["size"] == stat.st_size
+            ):
+                continue
+
+            # touched but identical content → only refresh the fingerprint
+            digest = _file_sha256(file)
+            if not (cached and cached["sha256"] == digest and date in self.counts):
+                with open(file, "r", encoding="utf-8") as f:
+                    self.counts[date] = json.load(f).get("topics", {})
+                parsed += 1
+
+            self.files[date] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+            }
+
+        for date in set(self.counts) - seen:
+            del self.counts[date]
+            self.files.pop(date, None)
+
+        return parsed
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files, "counts": self.counts}, f)
@@ -6,6 +6,8 @@ from langgraph.graph import StateGraph, END
 from runner_phase1 import run as run_phase1
 from runner_phase2 import run_phase3_all_days
 from runner_phase3 import run_phase4
+from review_analysis.metrics import node_timer
+from review_analysis.pipeline import run_streaming_pipeline
 
 
 # ======================================================
@@ -35,6 +37,16 @@ def phase3_node(state: EndToEndState) -> EndToEndState:
     return state
 
 
+def streaming_node(state: EndToEndState) -> EndToEndState:
+    # all three phases without a full-window fetch barrier
+    run_streaming_pipeline(
+        app_url=state["app_url"],
+        target_date=state["target_date"],
+        lookback_days=state["lookback_days"],
+    )
+    return state
+
+
 def phase4_node(state: EndToEndState) -> EndToEndState:
     run_phase4(
         product_id=state["product_id"],
@@ -49,10 +61,11 @@ def phase4_node(state: EndToEndState) -> EndToEndState:
 # ======================================================
 def build_end_to_end_workflow():
     graph = StateGraph(EndToEndState)
+    timed = node_timer("end_to_end")
 
-    graph.add_node("phase1", phase1_node)
-    graph.add_node("phase3", phase3_node)
-    graph.add_node("phase4", phase4_node)
+    graph.add_node("phase1", timed("phase1", phase1_node))
+    graph.add_node("phase3", timed("phase3", phase3_node))
+    graph.add_node("phase4", timed("phase4", phase4_node))
 
     graph.set_entry_point("phase1")
     graph.add_edge("phase1", "phase3")
@@ -60,3 +73,15 @@ def build_end_to_end_workflow():
     graph.add_edge("phase4", END)
 
     return graph.compile()
+
+
+def build_streaming_workflow():
+    graph = StateGraph(EndToEndState)
+    timed = node_timer("end_to_end")
+
+    graph.add_node("streaming", timed("streaming", streaming_node))
+
+    graph.set_entry_point("streaming")
+    graph.add_edge("streaming", END)
+
+    return graph.compile()
@@ -1,19 +1,32 @@
 # review_analysis/workflow_phase1.py
 
-from typing import TypedDict, Optional, List
+from typing import TypedDict, Optional, List, Dict
 from datetime import datetime, timedelta
 import pandas as pd
 
 from langgraph.graph import StateGraph, END
 
 from review_analysis.dataset import (
+    TRANSIENT_COLUMNS,
     extract_play_store_id,
     fetch_reviews,
+    load_watermark,
+    save_watermark,
+    update_watermark,
+    watermark_covers,
 )
+from review_analysis.storage import (
+    find_stored,
+    get_storage,
+    read_records,
+    with_extension,
+)
+from review_analysis.metrics import node_timer
+from review_analysis.store import ReviewStore
 from review_analysis.config import (
     INTERIM_DATA_DIR,
     PROCESSED_DATA_DIR,
-    client,
+    get_serpapi_client,
 )
 
 # ============================================================
@@ -24,6 +37,9 @@ class ReviewState(TypedDict):
     app_url: str
     target_date: str
     lookback_days: int
+    incremental: bool
+    storage_format: Optional[str]
+    use_store: bool
 
     # Derived
     product_id: Optional[str]
@@ -32,6 +48,8 @@ class ReviewState(TypedDict):
 
     # Data
     reviews_df: Optional[pd.DataFrame]
+    watermark: Optional[Dict]
+    next_watermark: Optional[Dict]
 
     # Outputs
     interim_output_path: Optional[str]
@@ -67,83 +85,158 @@ def compute_date_window_node(state: ReviewState) -> ReviewState:
 # ============================================================
 # Node 3: Fetch Reviews from SerpAPI
 # ============================================================
+def watermark_path(product_id: str):
+    return INTERIM_DATA_DIR / f"watermark_{product_id}.json"
+
+
 def fetch_reviews_node(state: ReviewState) -> ReviewState:
+    # incremental runs stop paginating at the last ingested review
+    watermark = None
+    if state.get("incremental", True):
+        watermark = load_watermark(watermark_path(state["product_id"]))
+
     df = fetch_reviews(
-        client=client,
+        client=get_serpapi_client(),
         product_id=state["product_id"],
         START_DATE=state["start_date"],
         END_DATE=state["end_date"],
+        watermark=watermark,
     )
 
-    if df.empty:
+    # nothing new is fine only if the window was already ingested
+    if df.empty and not watermark_covers(watermark, state["start_date"]):
         raise ValueError("No reviews fetched for the given date range")
 
+    print(f" Fetched {len(df)} new reviews")
+
+    state["watermark"] = watermark
+    state["next_watermark"] = update_watermark(
+        watermark, df, state["start_date"], state["end_date"]
+    )
     state["reviews_df"] = df
     return state
 
 
 # ============================================================
-# Node 4: Persist Interim JSON (Single File)
+# Node 4: Persist Interim Reviews (Single File)
 # ============================================================
 def persist_interim_node(state: ReviewState) -> ReviewState:
-    df = state["reviews_df"].copy()
+    df = state["reviews_df"].drop(columns=TRANSIENT_COLUMNS)
 
     # Normalize Date format
     df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d")
 
     INTERIM_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    filename = f"reviews_{state['product_id']}_T={state['end_date']}.json"
-    output_path = INTERIM_DATA_DIR / filename
+    storage = get_storage(state.get("storage_format"))
+    base_path = INTERIM_DATA_DIR / f"reviews_{state['product_id']}_T={state['end_date']}"
+    output_path = with_extension(base_path, storage.extension)
+
+    # incremental runs only fetched the delta → merge it into the last dump
+    dump = df
+    existing_path = find_stored(base_path)
+    if state.get("watermark") and existing_path is not None:
+        existing = read_records(existing_path, columns=list(df.columns))
+        if "ReviewId" in df.columns:
+            existing = existing[~existing["ReviewId"].isin(set(df["ReviewId"].dropna()))]
+        dump = pd.concat([df, existing], ignore_index=True).sort_values(
+            by="Date", ascending=False, kind="stable"
+        )
 
-    df.to_json(
-        output_path,
-        orient="records",
-        indent=4
-    )
+    # an incremental run with nothing new must not clobber the last dump
+    if not df.empty or existing_path is None:
+        storage.write(dump, base_path)
+        if existing_path is not None and existing_path != output_path:
+            existing_path.unlink()
 
     state["interim_output_path"] = str(output_path)
-    state["reviews_df"] = df  # keep normalized version
+    state["reviews_df"] = df  # keep normalized version (the delta, split below)
     return state
 
 
 # ============================================================
 # Node 5: Split Reviews by Day → data/processed
 # ============================================================
+def write_daily_reviews(product_id, date, group, storage, append=False, store=None):
+    """Writes one day's reviews to data/processed (and the review store)."""
+    PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+    base_path = PROCESSED_DATA_DIR / f"reviews_{product_id}_{date}"
+    existing_path = find_stored(base_path)
+
+    # incremental runs only fetched new reviews → append to the day file
+    if append and existing_path is not None:
+        existing = read_records(existing_path, columns=list(group.columns))
+
+        # a run that died before saving its watermark is re-fetched in full:
+        # reviews already in the file are skipped by id, so appends are idempotent
+        if "ReviewId" in group.columns:
+            known = set(existing["ReviewId"].dropna())
+            group = group[~group["ReviewId"].isin(known)]
+
+        group = pd.concat([group, existing], ignore_index=True)
+
+    output_path = storage.write(group, base_path)
+
+    # a day lives in exactly one format
+    if existing_path is not None and existing_path != output_path:
+        existing_path.unlink()
+
+    if store is not None:
+        store.replace_reviews(product_id, str(date), group["Review"].tolist())
+
+    return output_path
+
+
 def split_daily_node(state: ReviewState) -> ReviewState:
     df = state["reviews_df"]
 
-    PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
-
     daily_paths: List[str] = []
 
-    for date, group in df.groupby("Date"):
-        filename = f"reviews_{state['product_id']}_{date}.json"
-        output_path = PROCESSED_DATA_DIR / filename
+    storage = get_storage(state.get("storage_format"))
+    store = ReviewStore() if state.get("use_store", True) else None
 
-        group.to_json(
-            output_path,
-            orient="records",
-            indent=4
+    for date, group in df.groupby("Date"):
+        output_path = write_daily_reviews(
+            state["product_id"],
+            date,
+            group,
+            storage,
+            append=bool(state.get("watermark")),
+            store=store,
         )
-
         daily_paths.append(str(output_path))
 
     state["daily_output_paths"] = daily_paths
     return state
 
 
+# ============================================================
+# Node 6: Advance Ingestion Watermark
+# ============================================================
+def save_watermark_node(state: ReviewState) -> ReviewState:
+    # only after the daily files are written, so a failed run re-fetches;
+    # write_daily_reviews skips the re-fetched reviews already on disk by id
+    if state["next_watermark"]:
+        save_watermark(watermark_path(state["product_id"]), state["next_watermark"])
+
+    state["watermark"] = state["next_watermark"]
+    return state
+
+
 # ============================================================
 # Build LangGraph
 # ============================================================
 def build_review_workflow():
     graph = StateGraph(ReviewState)
+    timed = node_timer("phase1")
 
-    graph.add_node("extract_product_id", extract_product_id_node)
-    graph.add_node("compute_date_window", compute_date_window_node)
-    graph.add_node("fetch_reviews", fetch_reviews_node)
-    graph.add_node("persist_interim", persist_interim_node)
-    graph.add_node("split_daily", split_daily_node)
+    graph.add_node("extract_product_id", timed("extract_product_id", extract_product_id_node))
+    graph.add_node("compute_date_window", timed("compute_date_window", compute_date_window_node))
+    graph.add_node("fetch_reviews", timed("fetch_reviews", fetch_reviews_node))
+    graph.add_node("persist_interim", timed("persist_interim", persist_interim_node))
+    graph.add_node("split_daily", timed("split_daily", split_daily_node))
+    graph.add_node("save_watermark", timed("save_watermark", save_watermark_node))
 
     graph.set_entry_point("extract_product_id")
 
@@ -151,6 +244,7 @@ def build_review_workflow():
     graph.add_edge("compute_date_window", "fetch_reviews")
     graph.add_edge("fetch_reviews", "persist_interim")
     graph.add_edge("persist_interim", "split_daily")
-    graph.add_edge("split_daily", END)
+    graph.add_edge("split_daily", "save_watermark")
+    graph.add_edge("save_watermark", END)
 
     return graph.compile()
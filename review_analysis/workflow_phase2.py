@@ -1,15 +1,28 @@
 # review_analysis/workflow_phase2.py
 
 from typing import TypedDict, List, Dict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
+import threading
 import time
 
 from langgraph.graph import StateGraph, END
 
 from llm.groq_client import groq_complete
 from llm.mistral_client import mistral_complete
-from llm.claude_client import claude_complete
+from llm.claude_client import claude_complete, claude_review_topics
+from llm.gemini_client import gemini_complete
+from llm.router import ProviderUnavailable, get_router
+from llm.utils import TruncatedResponse
+from review_analysis.batching import TokenBudgetBatcher, topic_prompt_tokens
+from review_analysis.checkpoint import BatchJournal
+from review_analysis.dedup import collapse_duplicates, normalize_review
+from review_analysis.fast_path import FastPathClassifier
+from review_analysis.metrics import node_timer
+from review_analysis.storage import find_stored, get_storage, read_records
+from review_analysis.store import ReviewStore
+from review_analysis.topic_index import DEFAULT_TOPIC_TOP_K, TopicIndex
 
 
 # ======================================================
@@ -20,15 +33,28 @@ class Phase3State(TypedDict):
     date: str
     input_file: str
     batch_size: int
+    adaptive_batching: bool
     output_dir: str
+    max_concurrency: int
+    near_dedup: bool
+    fast_path_threshold: float
+    topic_top_k: int
+    batch_approval: bool
+    routing: bool
+    hedge: bool
+    resume: bool
+    storage_format: str
+    use_store: bool
 
     mistral_calls: int
     max_mistral_calls: int
 
     reviews: List[str]
+    review_groups: Dict[str, List[str]]
     topics: Dict[str, Dict]
     assignments: List[Dict]
     topic_counts: Dict[str, int]
+    escalation_rate: float
 
 
 # ======================================================
@@ -39,14 +65,54 @@ def batched(items: List[str], size: int):
         yield items[i:i + size]
 
 
+def iter_waves(reviews: List[str], wave_size: int, batch_size: int, batcher=None, topic_tokens=None):
+    """
+    Yields waves of up to `wave_size` batches: fixed `batch_size` chunks, or
+    token-budget packed batches when a `batcher` is given. Adaptive waves are
+    packed lazily, so feedback from the previous wave and the registry's
+    growth (`topic_tokens()`) shape the next one.
+    """
+    if batcher is None:
+        batches = list(batched(reviews, batch_size))
+        for start in range(0, len(batches), wave_size):
+            yield batches[start:start + wave_size]
+        return
+
+    position = 0
+    while position < len(reviews):
+        wave = batcher.pack(reviews, topic_tokens(), limit=wave_size, start=position)
+        position += sum(len(batch) for batch in wave)
+        yield wave
+
+
 # ======================================================
 # Node 1: Load Daily Reviews
 # ======================================================
 def load_daily_reviews_node(state: Phase3State) -> Phase3State:
-    with open(state["input_file"], "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # only the Review column is needed (columnar backends skip the rest)
+    df = read_records(state["input_file"], columns=["Review"])
+
+    state["reviews"] = df["Review"].tolist()
+    return state
+
+
+# ======================================================
+# Node 1b: Collapse Duplicate Reviews
+# ======================================================
+def dedup_reviews_node(state: Phase3State) -> Phase3State:
+    """
+    Only one representative per duplicate group is sent to the LLMs;
+    its assignment is fanned back out to every member when merging.
+    """
+    groups = collapse_duplicates(
+        state["reviews"],
+        near_duplicates=state.get("near_dedup", False)
+    )
+
+    print(f" Collapsed {len(state['reviews'])} reviews into {len(groups)} representatives")
 
-    state["reviews"] = [r["Review"] for r in data]
+    state["review_groups"] = groups
+    state["reviews"] = [members[0] for members in groups.values()]
     return state
 
 
@@ -76,49 +142,255 @@ def load_or_init_topics_node(state: Phase3State) -> Phase3State:
 
 
 # ======================================================
-# Node 3: Categorize Reviews (Batch-wise)
+# Assignment Bookkeeping
 # ======================================================
-def categorize_batches_node(state: Phase3State) -> Phase3State:
-    topics = state["topics"]
+def record_assignment(state: Phase3State, review: str, topic_label: str):
+    """Records the topic for a review and every duplicate collapsed into it."""
+    members = state.get("review_groups", {}).get(normalize_review(review), [review])
+    for member in members:
+        state["assignments"].append(
+            {
+                "review": member,
+                "topic": topic_label
+            }
+        )
 
-    for batch in batched(state["reviews"], state["batch_size"]):
+    # Increment DAILY count
+    if topic_label not in state["topic_counts"]:
+        state["topic_counts"][topic_label] = 0
 
-        # ---------- Primary: Groq ----------
-        try:
-            response = groq_complete(
-                reviews=batch,
-                existing_topics=list(topics.values())
+    state["topic_counts"][topic_label] += len(members)
+
+
+# ======================================================
+# Node 2b: Local Fast-path Classification
+# ======================================================
+def fast_path_node(state: Phase3State) -> Phase3State:
+    """
+    Assigns trivial reviews locally when the classifier is confident and the
+    topic already exists; only the rest is escalated to the LLMs.
+    Disabled when `fast_path_threshold` is not set.
+    """
+    threshold = state.get("fast_path_threshold")
+    if threshold is None or not state["reviews"]:
+        state["escalation_rate"] = 1.0
+        return state
+
+    classifier = FastPathClassifier.from_history(
+        Path(state["output_dir"]) / state["product_id"],
+        before_date=state["date"]
+    )
+
+    escalated = []
+    for review in state["reviews"]:
+        prediction = classifier.predict(review)
+        if prediction is None:
+            escalated.append(review)
+            continue
+
+        topic_label, confidence = prediction
+        if confidence < threshold or topic_label not in state["topic_counts"]:
+            escalated.append(review)
+            continue
+
+        record_assignment(state, review, topic_label)
+
+    state["escalation_rate"] = len(escalated) / len(state["reviews"])
+    print(
+        f" Fast path assigned {len(state['reviews']) - len(escalated)} reviews, "
+        f"escalating {len(escalated)} ({state['escalation_rate']:.0%}) to the LLM"
+    )
+
+    state["reviews"] = escalated
+    return state
+
+
+# ======================================================
+# LLM Categorization (Groq → Mistral fallback)
+# ======================================================
+_mistral_budget_lock = threading.Lock()
+
+
+def categorize_batch(
+    batch: List[str],
+    existing_topics: List[Dict],
+    state: Phase3State,
+    batcher: TokenBudgetBatcher = None,
+    complete_missing: bool = True,
+):
+    """
+    Categorizes one batch against a snapshot of the topic registry.
+    Returns the LLM response, or None when the batch has to be skipped.
+    Safe to call from worker threads.
+
+    A truncated response is salvaged by safe_json_loads; the reviews it
+    does not cover (or whose rows were invalid) are re-issued once instead
+    of repeating the whole call.
+    """
+    if state.get("routing", False):
+        response = route_batch(batch, existing_topics, state, batcher)
+    else:
+        response = fallback_batch(batch, existing_topics, state, batcher)
+
+    if not response or not complete_missing:
+        return response
+
+    covered = {item["review"] for item in response}
+    missing = [review for review in batch if review not in covered]
+    if missing:
+        print(f" {len(missing)} reviews missing from the response. Re-issuing them.")
+
+        rest = categorize_batch(
+            missing, existing_topics, state, batcher, complete_missing=False
+        )
+        if rest:
+            response = response + rest
+
+    return response
+
+
+def fallback_batch(
+    batch: List[str],
+    existing_topics: List[Dict],
+    state: Phase3State,
+    batcher: TokenBudgetBatcher = None,
+):
+    """Groq first; the budgeted Mistral fallback when Groq fails."""
+    # ---------- Primary: Groq ----------
+    started = time.perf_counter()
+    try:
+        response = groq_complete(
+            reviews=batch,
+            existing_topics=existing_topics
+        )
+        if batcher is not None:
+            # a cut-off output means the batch was too large for the provider
+            batcher.observe(
+                latency=time.perf_counter() - started,
+                parse_failed=isinstance(response, TruncatedResponse),
             )
+        return response
 
-        # ---------- Fallback: Mistral (budgeted) ----------
-        except Exception:
+    # ---------- Fallback: Mistral (budgeted) ----------
+    except Exception as e:
+        # safe_json_loads raises ValueError → no usable item in the output;
+        # other failures (5xx, timeouts) say nothing about the batch size
+        if batcher is not None and isinstance(e, ValueError):
+            batcher.observe(parse_failed=True)
+
+        with _mistral_budget_lock:
             if state["mistral_calls"] >= state["max_mistral_calls"]:
                 print(" Mistral daily budget exhausted. Skipping batch.")
-                continue
+                return None
+            # reserve budget before the call so parallel batches cannot overshoot
+            state["mistral_calls"] += 1
 
-            try:
-                response = mistral_complete(
-                    reviews=batch,
-                    existing_topics=list(topics.values()),
-                    task="categorize"
-                )
-                state["mistral_calls"] += 1
+        try:
+            return mistral_complete(
+                reviews=batch,
+                existing_topics=existing_topics,
+                task="categorize"
+            )
 
-                # short cooldown to avoid burst limits
-                time.sleep(10)
+        except Exception:
+            with _mistral_budget_lock:
+                state["mistral_calls"] -= 1
+            print(" Mistral fallback failed. Skipping batch.")
+            return None
 
-            except Exception:
-                print(" Mistral fallback failed. Skipping batch.")
-                continue
 
-        # ---------- Process Responses ----------
-        for item in response:
-            review = item["review"]
-            proposed_topic = item["topic"]
-            is_new = item["is_new"]
+# ======================================================
+# LLM Categorization (latency-aware routing)
+# ======================================================
+def route_batch(
+    batch: List[str],
+    existing_topics: List[Dict],
+    state: Phase3State,
+    batcher: TokenBudgetBatcher = None,
+):
+    """
+    Sends the batch to the fastest healthy provider (llm.router) instead of
+    the fixed Groq → Mistral chain; with `hedge`, a slow call is raced
+    against the next provider. Mistral stays within its daily budget: it
+    is never raced, and a spent budget is not counted as a Mistral error.
+    """
+    def mistral_call():
+        with _mistral_budget_lock:
+            if state["mistral_calls"] >= state["max_mistral_calls"]:
+                raise ProviderUnavailable("Mistral daily budget exhausted")
+            state["mistral_calls"] += 1
+        try:
+            return mistral_complete(
+                reviews=batch,
+                existing_topics=existing_topics,
+                task="categorize"
+            )
+        except Exception:
+            with _mistral_budget_lock:
+                state["mistral_calls"] -= 1
+            raise
+
+    # preference order when the router has no latency history yet
+    calls = {
+        "groq": lambda: groq_complete(reviews=batch, existing_topics=existing_topics),
+        "mistral": mistral_call,
+        "gemini": lambda: gemini_complete(
+            reviews=batch, existing_topics=existing_topics, task="categorize"
+        ),
+    }
+    with _mistral_budget_lock:
+        if state["mistral_calls"] >= state["max_mistral_calls"]:
+            del calls["mistral"]
+
+    started = time.perf_counter()
+    try:
+        _, response = get_router().call(
+            calls, hedge=state.get("hedge", False), exclusive={"mistral"}
+        )
+    except Exception as e:
+        if batcher is not None and isinstance(e, ValueError):
+            batcher.observe(parse_failed=True)
+        print(" All providers failed. Skipping batch.")
+        return None
+
+    if batcher is not None:
+        batcher.observe(
+            latency=time.perf_counter() - started,
+            parse_failed=isinstance(response, TruncatedResponse),
+        )
+    return response
+
 
-            if not is_new:
-                topic_label = proposed_topic
+# ======================================================
+# Merge One Batch Response into Shared State
+# ======================================================
+def merge_batch_response(
+    response: List[Dict],
+    topics: Dict[str, Dict],
+    state: Phase3State,
+    index: TopicIndex = None,
+):
+    # one Claude call for all new-topic proposals of this batch; proposals it
+    # did not decide (or all of them, if it failed) take the per-topic path
+    resolved = None
+    if state.get("batch_approval", False):
+        resolved = review_new_topics_batch(response, topics)
+
+    rejected = []
+    for position, item in enumerate(response):
+        review = item["review"]
+        proposed_topic = item["topic"]
+        is_new = item["is_new"]
+
+        # the LLM only saw the top-k candidates, so a "new" topic may already exist
+        if not is_new or proposed_topic in topics:
+            topic_label = proposed_topic
+        else:
+            if resolved is not None and position in resolved:
+                if resolved[position] is None:
+                    rejected.append(review)
+                    continue
+                topic_label, description = resolved[position]
             else:
                 approved = validate_new_topic(
                     proposed_topic,
@@ -126,6 +398,7 @@ def categorize_batches_node(state: Phase3State) -> Phase3State:
                     topics
                 )
                 if not approved:
+                    rejected.append(review)
                     continue
 
                 topic_label, description = canonicalize_topic(
@@ -133,32 +406,163 @@ def categorize_batches_node(state: Phase3State) -> Phase3State:
                     review
                 )
 
+            # duplicate proposals resolve to the same canonical label
+            if topic_label not in topics:
                 topics[topic_label] = {
                     "label": topic_label,
                     "description": description,
                 }
+                if index is not None:
+                    index.add(topics[topic_label])
 
-                if topic_label not in state["topic_counts"]:
-                    state["topic_counts"][topic_label] = 0
+            if topic_label not in state["topic_counts"]:
+                state["topic_counts"][topic_label] = 0
 
-            # Record assignment
-            state["assignments"].append(
-                {
-                    "review": review,
-                    "topic": topic_label
-                }
+        record_assignment(state, review, topic_label)
+
+    if rejected:
+        recategorize_rejected(rejected, topics, state)
+
+
+def recategorize_rejected(reviews: List[str], topics: Dict[str, Dict], state: Phase3State):
+    """
+    A proposal is mostly rejected as a near-duplicate of a topic that was
+    pruned from the batch's top-k candidates. Those reviews get one more
+    call against the full registry; only existing topics are accepted, so a
+    review whose topic is still rejected stays unassigned.
+    """
+    print(f" Re-categorizing {len(reviews)} reviews with rejected topics against all topics")
+
+    response = categorize_batch(
+        reviews, list(topics.values()), state, complete_missing=False
+    )
+    for item in response or []:
+        if item["topic"] in topics:
+            record_assignment(state, item["review"], item["topic"])
+
+
+# ======================================================
+# Node 3: Categorize Reviews (Batch-wise, Concurrent)
+# ======================================================
+def categorize_batches_node(state: Phase3State) -> Phase3State:
+    """
+    Categorizes batches in waves of up to `max_concurrency` concurrent calls.
+
+    Every batch of a wave is categorized against the same registry snapshot,
+    and responses are merged strictly in batch order, so new-topic approval
+    is deterministic regardless of which call returns first. The next wave
+    starts only once the whole wave is merged (its new topics must be in the
+    snapshot), so one slow batch holds back the rest of its wave.
+    `max_concurrency=1` is the sequential mode.
+
+    Each batch only sees the `topic_top_k` most relevant topics from the
+    registry index, keeping prompt size bounded as the registry grows.
+    Reviews whose new-topic proposal is rejected are retried against the
+    full registry (see recategorize_rejected) rather than dropped.
+
+    With `adaptive_batching`, batches are packed by estimated tokens rather
+    than `batch_size` reviews (see review_analysis.batching). With `routing`,
+    each batch goes to the fastest healthy provider (see route_batch).
+
+    Every merged batch is appended to a checkpoint journal; a rerun after
+    a failure replays it and only categorizes the remaining reviews.
+    """
+    journal = BatchJournal(state["output_dir"], state["product_id"], state["date"])
+    reviews = replay_journal(state, journal)
+
+    topics = state["topics"]
+    max_concurrency = max(1, state.get("max_concurrency", 1))
+    top_k = state.get("topic_top_k", DEFAULT_TOPIC_TOP_K)
+    index = TopicIndex(topics)
+
+    batcher = None
+    if state.get("adaptive_batching", False):
+        batcher = TokenBudgetBatcher.for_providers()
+
+    waves = iter_waves(
+        reviews,
+        max_concurrency,
+        state["batch_size"],
+        batcher=batcher,
+        topic_tokens=lambda: topic_prompt_tokens(topics, top_k),
+    )
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        for wave in waves:
+            candidates = [index.candidates(batch, top_k) for batch in wave]
+
+            responses = pool.map(
+                lambda args: categorize_batch(args[0], args[1], state, batcher),
+                zip(wave, candidates)
             )
 
-            # Increment DAILY count
-            if topic_label not in state["topic_counts"]:
-                state["topic_counts"][topic_label] = 0
+            # pool.map yields in submission order → deterministic merge
+            for batch, response in zip(wave, responses):
+                if response is None:
+                    continue
 
-            state["topic_counts"][topic_label] += 1
+                mistral_before = state["mistral_calls"]
+                assignments_before = len(state["assignments"])
+                counts_before = dict(state["topic_counts"])
+                topics_before = set(topics)
+
+                merge_batch_response(response, topics, state, index)
+
+                journal.append(
+                    {
+                        "reviews": batch,
+                        "assignments": state["assignments"][assignments_before:],
+                        "new_topics": {
+                            label: topics[label] for label in topics if label not in topics_before
+                        },
+                        "count_deltas": {
+                            label: count - counts_before.get(label, 0)
+                            for label, count in state["topic_counts"].items()
+                            if count != counts_before.get(label, 0)
+                        },
+                        "mistral_calls": state["mistral_calls"] - mistral_before,
+                    }
+                )
+
+    if state.get("routing", False):
+        for provider, stats in get_router().stats.items():
+            summary = stats.summary()
+            print(
+                f" {provider}: {summary['calls']} calls, p50={summary['p50']}, "
+                f"p95={summary['p95']}, errors={summary['error_rate']:.0%}"
+            )
 
     state["topics"] = topics
     return state
 
 
+# ======================================================
+# Checkpoint Replay
+# ======================================================
+def replay_journal(state: Phase3State, journal: BatchJournal) -> List[str]:
+    """
+    Re-applies batches completed by a previous, interrupted run and returns
+    the reviews that still need categorization.
+    """
+    entries = journal.load() if state.get("resume", True) else []
+    if not entries:
+        journal.clear()
+        return state["reviews"]
+
+    done = set()
+    for entry in entries:
+        done.update(entry["reviews"])
+        state["topics"].update(entry["new_topics"])
+        state["assignments"].extend(entry["assignments"])
+        for label, delta in entry["count_deltas"].items():
+            state["topic_counts"][label] = state["topic_counts"].get(label, 0) + delta
+        state["mistral_calls"] += entry.get("mistral_calls", 0)
+
+    remaining = [review for review in state["reviews"] if review not in done]
+    print(f" Resumed {len(entries)} checkpointed batches, {len(remaining)} reviews left")
+    return remaining
+
+
 # ======================================================
 # Claude Validation (Strict)
 # ======================================================
@@ -171,6 +575,69 @@ def validate_new_topic(proposed_topic, review, topics) -> bool:
     return response.get("approved", False)
 
 
+# ======================================================
+# Claude Batched Validation + Canonicalization
+# ======================================================
+def review_new_topics_batch(response: List[Dict], topics: Dict[str, Dict]):
+    """
+    Approves and canonicalizes every new-topic proposal of a batch response
+    in a single Claude call, replacing one Claude + one Mistral call per topic.
+
+    Returns {response position: (label, description)} for approved proposals
+    and None for rejected ones, or None if the batched call failed and the
+    per-topic path should be used. Proposals missing from the decisions (a
+    reply cut off and salvaged as a TruncatedResponse) are left out of the
+    mapping, so they go through the per-topic path too.
+    """
+    proposals = [
+        {
+            "index": position,
+            "proposed_topic": item["topic"],
+            "review": item["review"],
+        }
+        for position, item in enumerate(response)
+        if item["is_new"] and item["topic"] not in topics
+    ]
+    if not proposals:
+        return {}
+
+    proposed = {p["index"] for p in proposals}
+
+    try:
+        decisions = claude_review_topics(
+            proposals=proposals,
+            existing_topics=list(topics.values())
+        )
+
+        resolved = {}
+        for decision in decisions:
+            index = decision["index"]
+            if type(index) is not int or index not in proposed:
+                raise ValueError(f"Unknown proposal index: {index!r}")
+            if index in resolved:
+                continue
+            if decision["approved"] is not True:
+                resolved[index] = None
+                continue
+            label = decision.get("label")
+            if not isinstance(label, str) or not label.strip():
+                raise ValueError(f"Approved proposal {index} has no label")
+            description = decision.get("description")
+            resolved[index] = (
+                label.strip(),
+                description if isinstance(description, str) else "",
+            )
+    except Exception:
+        print(" Batched topic approval failed. Falling back to per-topic approval.")
+        return None
+
+    undecided = proposed - resolved.keys()
+    if undecided:
+        print(f" {len(undecided)} proposals undecided. Falling back to per-topic approval.")
+
+    return resolved
+
+
 # ======================================================
 # Mistral Canonicalization
 # ======================================================
@@ -193,12 +660,19 @@ def persist_outputs_node(state: Phase3State) -> Phase3State:
     with open(base_dir / "topics.json", "w", encoding="utf-8") as f:
         json.dump(state["topics"], f, indent=4)
 
-    with open(
-        base_dir / f"topic_assignments_{state['date']}.json",
-        "w",
-        encoding="utf-8"
-    ) as f:
-        json.dump(state["assignments"], f, indent=4)
+    storage = get_storage(state.get("storage_format"))
+    base_path = base_dir / f"topic_assignments_{state['date']}"
+    previous_path = find_stored(base_path)
+
+    output_path = storage.write_records(
+        state["assignments"],
+        base_path,
+        columns=["review", "topic"]
+    )
+
+    # a day lives in exactly one format
+    if previous_path is not None and previous_path != output_path:
+        previous_path.unlink()
 
     with open(
         base_dir / f"topic_counts_{state['date']}.json",
@@ -214,6 +688,14 @@ def persist_outputs_node(state: Phase3State) -> Phase3State:
             indent=4
         )
 
+    if state.get("use_store", True):
+        store = ReviewStore()
+        store.upsert_topics(state["product_id"], state["topics"])
+        store.replace_assignments(state["product_id"], state["date"], state["assignments"])
+
+    # outputs are durable now; the day no longer needs its checkpoints
+    BatchJournal(state["output_dir"], state["product_id"], state["date"]).clear()
+
     return state
 
 
@@ -222,15 +704,20 @@ def persist_outputs_node(state: Phase3State) -> Phase3State:
 # ======================================================
 def build_phase3_workflow():
     graph = StateGraph(Phase3State)
+    timed = node_timer("phase2")
 
-    graph.add_node("load_reviews", load_daily_reviews_node)
-    graph.add_node("load_topics", load_or_init_topics_node)
-    graph.add_node("categorize", categorize_batches_node)
-    graph.add_node("persist", persist_outputs_node)
+    graph.add_node("load_reviews", timed("load_reviews", load_daily_reviews_node))
+    graph.add_node("dedup_reviews", timed("dedup_reviews", dedup_reviews_node))
+    graph.add_node("load_topics", timed("load_topics", load_or_init_topics_node))
+    graph.add_node("fast_path", timed("fast_path", fast_path_node))
+    graph.add_node("categorize", timed("categorize", categorize_batches_node))
+    graph.add_node("persist", timed("persist", persist_outputs_node))
 
     graph.set_entry_point("load_reviews")
-    graph.add_edge("load_reviews", "load_topics")
-    graph.add_edge("load_topics", "categorize")
+    graph.add_edge("load_reviews", "dedup_reviews")
+    graph.add_edge("dedup_reviews", "load_topics")
+    graph.add_edge("load_topics", "fast_path")
+    graph.add_edge("fast_path", "categorize")
     graph.add_edge("categorize", "persist")
     graph.add_edge("persist", END)
 
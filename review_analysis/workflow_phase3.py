@@ -3,10 +3,15 @@
 from typing import TypedDict, Dict, List
 from pathlib import Path
 import json
+import numpy as np
 import pandas as pd
 
 from langgraph.graph import StateGraph, END
 
+from review_analysis.metrics import node_timer
+from review_analysis.store import ReviewStore
+from review_analysis.trend_cache import TrendCache
+
 
 # ======================================================
 # Graph State
@@ -15,6 +20,8 @@ class Phase4State(TypedDict):
     product_id: str
     input_dir: str
     output_dir: str
+    use_trend_cache: bool
+    use_store: bool
 
     topics: List[str]
     dates: List[str]
@@ -26,6 +33,9 @@ class Phase4State(TypedDict):
 # Node 1: Load Canonical Topics + Daily Counts
 # ======================================================
 def load_topic_counts_node(state: Phase4State) -> Phase4State:
+    if state.get("use_store", False):
+        return load_topic_counts_from_store(state)
+
     product_dir = Path(state["input_dir"]) / state["product_id"]
 
     # --------------------------------------------------
@@ -50,22 +60,27 @@ def load_topic_counts_node(state: Phase4State) -> Phase4State:
     dates = [f.stem.replace("topic_counts_", "") for f in date_files]
 
     # --------------------------------------------------
-    # 3. Initialize FULL Topic × Date matrix with zeros
+    # 3. Fold new / changed daily files into the cached matrix
     # --------------------------------------------------
-    topic_dates = {
-        topic: {date: 0 for date in dates}
-        for topic in canonical_topics
-    }
+    if state.get("use_trend_cache", True):
+        cache = TrendCache(product_dir)
+        parsed = cache.refresh(date_files)
+        cache.save()
+        print(f" Trend cache: parsed {parsed} of {len(date_files)} daily count files")
+        daily_counts = cache.counts
+    else:
+        daily_counts = {}
+        for file in date_files:
+            with open(file, "r", encoding="utf-8") as f:
+                daily_counts[file.stem.replace("topic_counts_", "")] = json.load(f).get("topics", {})
 
     # --------------------------------------------------
-    # 4. Fill actual counts where present
+    # 4. Sparse Topic × Date counts (missing cells are zero)
     # --------------------------------------------------
-    for file in date_files:
-        date = file.stem.replace("topic_counts_", "")
-        with open(file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    topic_dates = {topic: {} for topic in canonical_topics}
 
-        for topic, count in data.get("topics", {}).items():
+    for date in dates:
+        for topic, count in daily_counts.get(date, {}).items():
             if topic in topic_dates:
                 topic_dates[topic][date] = count
             # else: ignore deprecated / rewritten topic labels
@@ -76,22 +91,52 @@ def load_topic_counts_node(state: Phase4State) -> Phase4State:
     return state
 
 
+def load_topic_counts_from_store(state: Phase4State) -> Phase4State:
+    """Same state as load_topic_counts_node, aggregated by SQL in the review store."""
+    store = ReviewStore()
+
+    # days persisted only as files (older runs, use_store=False) are imported once
+    store.import_outputs(state["input_dir"], state["product_id"])
+
+    canonical_topics = store.topic_labels(state["product_id"])
+    if not canonical_topics:
+        raise FileNotFoundError(f"No topics in review store for {state['product_id']}")
+
+    daily_counts = store.topic_counts(state["product_id"])
+
+    topic_dates = {topic: {} for topic in canonical_topics}
+    for date, counts in daily_counts.items():
+        for topic, count in counts.items():
+            if topic in topic_dates:
+                topic_dates[topic][date] = count
+
+    state["topics"] = canonical_topics
+    state["dates"] = sorted(daily_counts)
+    state["topic_dates"] = topic_dates
+    return state
+
+
 # ======================================================
 # Node 2: Build Trend Table (DataFrame)
 # ======================================================
 def build_trend_table_node(state: Phase4State) -> Phase4State:
-    df = pd.DataFrame(
-        index=state["topics"],
-        columns=state["dates"],
-        data=0,
-        dtype=int,
-    )
+    topics = state["topics"]
+    dates = state["dates"]
+
+    # Fill a dense Topic × Date array by integer position, one row at a time,
+    # and wrap it in a DataFrame once (no per-cell .loc writes)
+    topic_pos = {topic: i for i, topic in enumerate(topics)}
+    date_pos = {date: j for j, date in enumerate(dates)}
+    values = np.zeros((len(topics), len(dates)), dtype=int)
 
     for topic, date_counts in state["topic_dates"].items():
-        for date, count in date_counts.items():
-            df.loc[topic, date] = count
+        row = topic_pos.get(topic)
+        if row is None or not date_counts:
+            continue
+        cols = [date_pos[date] for date in date_counts]
+        values[row, cols] = list(date_counts.values())
 
-    state["trend_df"] = df
+    state["trend_df"] = pd.DataFrame(values, index=topics, columns=dates)
     return state
 
 
@@ -116,10 +161,11 @@ def persist_trend_report_node(state: Phase4State) -> Phase4State:
 # ======================================================
 def build_phase4_workflow():
     graph = StateGraph(Phase4State)
+    timed = node_timer("phase3")
 
-    graph.add_node("load_counts", load_topic_counts_node)
-    graph.add_node("build_table", build_trend_table_node)
-    graph.add_node("persist", persist_trend_report_node)
+    graph.add_node("load_counts", timed("load_counts", load_topic_counts_node))
+    graph.add_node("build_table", timed("build_table", build_trend_table_node))
+    graph.add_node("persist", timed("persist", persist_trend_report_node))
 
     graph.set_entry_point("load_counts")
     graph.add_edge("load_counts", "build_table")
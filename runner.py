@@ -1,19 +1,23 @@
 # runner_end_to_end.py
 
-from review_analysis.workflow import build_end_to_end_workflow
+from review_analysis.workflow import build_end_to_end_workflow, build_streaming_workflow
 from review_analysis.dataset import extract_play_store_id
+from review_analysis.metrics import instrumented_run
 
 
+@instrumented_run("end_to_end")
 def run_end_to_end(
     app_url: str,
     target_date: str,
     lookback_days: int = 3,
+    streaming: bool = False,
 ):
     product_id = extract_play_store_id(app_url)
     if not product_id:
         raise ValueError("Invalid Play Store URL")
 
-    graph = build_end_to_end_workflow()
+    # streaming categorizes each day (newest first) while later pages download
+    graph = build_streaming_workflow() if streaming else build_end_to_end_workflow()
 
     graph.invoke(
         {
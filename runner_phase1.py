@@ -1,12 +1,17 @@
 # runner_phase1.py
 
+from review_analysis.metrics import instrumented_run
 from review_analysis.workflow_phase1 import build_review_workflow
 
 
+@instrumented_run("phase1")
 def run(
     app_url: str,
     target_date: str,
     lookback_days: int = 3,
+    incremental: bool = True,
+    storage_format: str = None,
+    use_store: bool = True,
 ):
     """
     Entry point for review ingestion + daily segmentation workflow
@@ -19,6 +24,9 @@ def run(
             "app_url": app_url,
             "target_date": target_date,
             "lookback_days": lookback_days,
+            "incremental": incremental,
+            "storage_format": storage_format,
+            "use_store": use_store,
         }
     )
 
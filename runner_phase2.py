@@ -2,35 +2,96 @@
 
 from pathlib import Path
 import re
-import time
 
+from review_analysis.metrics import instrumented_run
+from review_analysis.scheduler import DEFAULT_MAX_PRODUCTS, ProductScheduler
+from review_analysis.storage import glob_stored
+from review_analysis.topic_index import DEFAULT_TOPIC_TOP_K
 from review_analysis.workflow_phase2 import build_phase3_workflow
 
 
 PROCESSED_DIR = Path("data/processed")
 
 MAX_MISTRAL_CALLS_PER_DAY = 100
-DAY_DELAY_SECONDS = 60
+MAX_CONCURRENT_BATCHES = 4
 
 
 def parse_filename(filename: str):
     """
-    reviews_<product_id>_<YYYY-MM-DD>.json
+    reviews_<product_id>_<YYYY-MM-DD>.<json|parquet>
     """
-    match = re.match(r"reviews_(.+)_(\d{4}-\d{2}-\d{2})\.json", filename)
+    match = re.match(r"reviews_(.+)_(\d{4}-\d{2}-\d{2})\.(json|parquet)$", filename)
     if not match:
         return None, None
     return match.group(1), match.group(2)
 
 
+def run_phase3_day(
+    graph,
+    product_id: str,
+    date: str,
+    file_path: Path,
+    batch_size: int = 10,
+    output_dir: str = "output",
+    max_concurrency: int = MAX_CONCURRENT_BATCHES,
+    near_dedup: bool = False,
+    fast_path_threshold: float = None,
+    topic_top_k: int = DEFAULT_TOPIC_TOP_K,
+    batch_approval: bool = True,
+    storage_format: str = None,
+    use_store: bool = True,
+    adaptive_batching: bool = False,
+    routing: bool = False,
+    hedge: bool = False,
+) -> int:
+    """
+    Categorizes one product/day with a compiled Phase 2 graph.
+    Returns the number of reviews assigned.
+    """
+    final_state = graph.invoke(
+        {
+            "product_id": product_id,
+            "date": date,
+            "input_file": str(file_path),
+            "batch_size": batch_size,
+            "adaptive_batching": adaptive_batching,
+            "output_dir": output_dir,
+            "max_concurrency": max_concurrency,
+            "near_dedup": near_dedup,
+            "fast_path_threshold": fast_path_threshold,
+            "topic_top_k": topic_top_k,
+            "batch_approval": batch_approval,
+            "routing": routing,
+            "hedge": hedge,
+            "storage_format": storage_format,
+            "use_store": use_store,
+            "mistral_calls": 0,
+            "max_mistral_calls": MAX_MISTRAL_CALLS_PER_DAY,
+        }
+    )
+    return len(final_state["assignments"])
+
+
+@instrumented_run("phase2")
 def run_phase3_all_days(
     batch_size: int = 10,
     output_dir: str = "output",
+    max_concurrency: int = MAX_CONCURRENT_BATCHES,
+    near_dedup: bool = False,
+    fast_path_threshold: float = None,
+    topic_top_k: int = DEFAULT_TOPIC_TOP_K,
+    batch_approval: bool = True,
+    storage_format: str = None,
+    use_store: bool = True,
+    max_products: int = DEFAULT_MAX_PRODUCTS,
+    adaptive_batching: bool = False,
+    routing: bool = False,
+    hedge: bool = False,
 ):
     graph = build_phase3_workflow()
     product_files = {}
 
-    for file in PROCESSED_DIR.glob("reviews_*.json"):
+    for file in glob_stored(PROCESSED_DIR, "reviews_"):
         product_id, date = parse_filename(file.name)
         if product_id:
             product_files.setdefault(product_id, []).append((date, file))
@@ -39,32 +100,28 @@ def run_phase3_all_days(
         print(" No processed review files found.")
         return
 
-    for product_id, entries in product_files.items():
-        print(f"\n Processing product: {product_id}")
-        entries.sort(key=lambda x: x[0])
-
-        for date, file_path in entries:
-            print(f" Processing date: {date}")
-
-            try:
-                graph.invoke(
-                    {
-                        "product_id": product_id,
-                        "date": date,
-                        "input_file": str(file_path),
-                        "batch_size": batch_size,
-                        "output_dir": output_dir,
-                        "mistral_calls": 0,
-                        "max_mistral_calls": MAX_MISTRAL_CALLS_PER_DAY,
-                    }
-                )
-            except Exception as e:
-                print(f"   Failed for {date}: {e}")
-
-            print(f"   Waiting {DAY_DELAY_SECONDS}s before next day...")
-            time.sleep(DAY_DELAY_SECONDS)
-
-        print(f" Completed product: {product_id}")
+    def run_day(product_id: str, date: str, file_path: Path) -> int:
+        return run_phase3_day(
+            graph,
+            product_id,
+            date,
+            file_path,
+            batch_size=batch_size,
+            adaptive_batching=adaptive_batching,
+            output_dir=output_dir,
+            max_concurrency=max_concurrency,
+            near_dedup=near_dedup,
+            fast_path_threshold=fast_path_threshold,
+            topic_top_k=topic_top_k,
+            batch_approval=batch_approval,
+            routing=routing,
+            hedge=hedge,
+            storage_format=storage_format,
+            use_store=use_store,
+        )
+
+    print(f"\n Processing {len(product_files)} products ({max_products} in parallel)")
+    return ProductScheduler(run_day, max_products=max_products).run(product_files)
 
 
 if __name__ == "__main__":
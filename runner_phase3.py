@@ -1,12 +1,15 @@
 # runner_phase3.py
 
+from review_analysis.metrics import instrumented_run
 from review_analysis.workflow_phase3 import build_phase4_workflow
 
 
+@instrumented_run("phase3")
 def run_phase4(
     product_id: str,
     input_dir: str = "output",
     output_dir: str = "output",
+    use_store: bool = False,
 ):
     graph = build_phase4_workflow()
 
@@ -15,6 +18,7 @@ def run_phase4(
             "product_id": product_id,
             "input_dir": input_dir,
             "output_dir": output_dir,
+            "use_store": use_store,
         }
     )
 
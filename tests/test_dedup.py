@@ -0,0 +1,26 @@
+# tests/test_dedup.py
+
+from review_analysis.dedup import collapse_duplicates
+
+
+def test_near_duplicates_chain_of_merged_reviews():
+    # the 2nd review merges into the 1st; the 3rd then shares LSH buckets
+    # with the merged (non-representative) 2nd one
+    reviews = [
+        "food arrived cold and late again ok",
+        "food arrived cold and late agai ok",
+        "food arrived cold and late ag ok",
+        "Food arrived cold and late again ok!!",
+    ]
+
+    groups = collapse_duplicates(reviews, near_duplicates=True)
+
+    assert sum(len(members) for members in groups.values()) == len(reviews)
+    first = next(iter(groups.values()))
+    assert first[0] == reviews[0]
+    assert reviews[3] in first
+
+
+def test_exact_mode_groups_normalized_text_only():
+    groups = collapse_duplicates(["Good app!", "good app", "good apps"])
+    assert list(groups.values()) == [["Good app!", "good app"], ["good apps"]]